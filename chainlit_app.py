@@ -25,7 +25,7 @@ import json as json_lib
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.models.schemas import SupportMessage
-from src.workflows.delve_langgraph_workflow import delve_langgraph_workflow
+from src.workflows.delve_langgraph_workflow import get_workflow
 from src.core.intent_classifier import IntentClassifier
 from src.core.session_manager import SessionManager
 from src.core.config import settings
@@ -70,7 +70,7 @@ async def on_chat_start():
         responder_agent = responder_setup.responder_agent if success else None
         
         if responder_agent:
-            delve_langgraph_workflow.set_responder_agent(responder_agent)
+            get_workflow().set_responder_agent(responder_agent)
             logger.info("Chainlit: Responder system connected to workflow")
     except Exception as e:
         logger.warning(f"Chainlit: Could not initialize responder system: {e}")
@@ -658,7 +658,7 @@ async def process_message_content(content: str, is_test: bool = False):
         # await workflow_msg.send()
         
         # Process through the workflow
-        result = await delve_langgraph_workflow.process_message(support_message)
+        result = await get_workflow().process_message(support_message)
         
         end_time = datetime.now()
         processing_time = (end_time - start_time).total_seconds()
@@ -1018,7 +1018,7 @@ async def process_slack_message(event):
         logger.info(f"Processing Slack message: {support_message.content[:50]}...")
         
         # Process through the workflow
-        result = await delve_langgraph_workflow.process_message(support_message)
+        result = await get_workflow().process_message(support_message)
         logger.info("Slack message processed successfully")
         
     except Exception as e:
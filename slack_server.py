@@ -17,7 +17,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.integrations.slack_client import slack_client
 from src.models.schemas import SupportMessage
-from src.workflows.delve_langgraph_workflow import delve_langgraph_workflow
+from src.workflows.delve_langgraph_workflow import get_workflow
 from src.utils.message_origin import MessageOriginDetector
 from src.core.session_manager import SessionManager
 from src.core.config import settings
@@ -161,7 +161,7 @@ async def process_slack_message(event):
                 logger.info(f"Processing Slack message: {support_message.content[:50]}...")
                 
                 # This will automatically handle escalation through ResponderAgent
-                result = await delve_langgraph_workflow.process_message(support_message)
+                result = await get_workflow().process_message(support_message)
                 
                 logger.info(f"Slack message processed successfully")
         
@@ -156,7 +156,7 @@ class EnhancedRAGAgent(BaseAgent):
             # Apply session memory to avoid repetitive facts
             from src.utils.session_memory import session_memory
             session_id = f"user_{message.user_id}"  # Simple session ID based on user
-            final_response = session_memory.suppress_repetitive_facts(session_id, enhanced_response)
+            final_response = session_memory.process_response(session_id, enhanced_response)
             
             return self.format_response(
                 response_text=final_response,
@@ -9,7 +9,7 @@ import uuid
 import asyncio
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import json
 import logging
@@ -44,6 +44,29 @@ class ConversationSession:
     ai_disabled: bool = False  # New: Track if AI is disabled due to human takeover
     human_assigned_at: Optional[datetime] = None  # New: When human took over
     assigned_agent_name: Optional[str] = None  # New: Human agent display name
+    # Maps Slack ts/thread_ts values to their position in history (derived, not persisted)
+    thread_ts_index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Build the thread timestamp index from the loaded history."""
+        for position, message in enumerate(self.history):
+            self._index_message(message, position)
+    
+    def _index_message(self, message: Dict[str, Any], position: int) -> None:
+        """Record the Slack timestamps carried by a history message."""
+        for key in ('ts', 'thread_ts'):
+            ts = message.get(key)
+            if ts:
+                self.thread_ts_index.setdefault(ts, position)
+    
+    def append_history(self, message: Dict[str, Any]) -> None:
+        """Append a message to history and keep the thread index in sync."""
+        self.history.append(message)
+        self._index_message(message, len(self.history) - 1)
+    
+    def has_thread(self, thread_ts: str) -> bool:
+        """Check whether the session owns the given Slack thread timestamp."""
+        return self.thread_ts == thread_ts or thread_ts in self.thread_ts_index
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage."""
@@ -205,7 +228,7 @@ class SessionManager:
             
             # Add timestamp to message
             message['timestamp'] = datetime.now(timezone.utc).isoformat()
-            session.history.append(message)
+            session.append_history(message)
             
             now = datetime.now(timezone.utc)
             update_data = {
@@ -359,7 +382,7 @@ class SessionManager:
             # Get current session to append closure message
             session = await self.get_session(session_id)
             if session:
-                session.history.append(closure_message)
+                session.append_history(closure_message)
             
             update_data = {
                 'state': SessionState.CLOSED.value,
@@ -387,6 +410,24 @@ class SessionManager:
             logger.error(f"Failed to get sessions for user {user_id}: {e}")
             return []
     
+    async def get_active_assigned_session_for_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get the user's assigned, AI-disabled session row (id and agent name only), if any."""
+        try:
+            result = (
+                self.supabase.table(self.table_name)
+                .select('session_id,ai_disabled,assigned_agent_name')
+                .eq('user_id', user_id)
+                .eq('state', SessionState.ASSIGNED.value)
+                .eq('ai_disabled', True)
+                .limit(1)
+                .execute()
+            )
+            
+            return result.data[0] if result.data else None
+        except Exception as e:
+            logger.error(f"Failed to get assigned session for user {user_id}: {e}")
+            return None
+    
     async def get_sessions_by_state(self, state: str) -> List['ConversationSession']:
         """Get all sessions in a specific state."""
         try:
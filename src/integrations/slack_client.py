@@ -7,6 +7,7 @@ from datetime import datetime
 
 from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 
@@ -30,6 +31,8 @@ class SlackClient:
         
         if self.enabled:
             self.client = AsyncWebClient(token=settings.slack_bot_token)
+            # Sleep for Retry-After and retry on 429 instead of surfacing the error
+            self.client.retry_handlers.append(AsyncRateLimitErrorRetryHandler(max_retry_count=2))
             self.app = AsyncApp(
                 token=settings.slack_bot_token,
                 signing_secret=settings.slack_signing_secret
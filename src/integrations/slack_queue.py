@@ -0,0 +1,84 @@
+"""
+Per-channel send queue for outbound Slack messages.
+
+Slack allows roughly one message per second per channel; bursts beyond that
+come back as HTTP 429. Routing sends through this queue turns that limit into
+cheap enqueues: each channel gets one worker that runs its sends in order.
+Sends are not spaced out up front; after a real 429 the rate-limit retry
+handler on SlackClient's AsyncWebClient sleeps for Retry-After inside the
+call, which holds the channel's later sends behind it.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+SendOp = Callable[..., Awaitable[Any]]
+
+
+class SlackSendQueue:
+    """FIFO queue per Slack channel, drained by one worker per channel."""
+    
+    def __init__(self, idle_timeout: float = 30.0):
+        self.idle_timeout = idle_timeout  # Idle workers exit; the next enqueue restarts them
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+    
+    async def enqueue(self, channel_id: str, op: SendOp, *args, **kwargs) -> None:
+        """Queue ``op(*args, **kwargs)`` behind earlier sends to the same channel and return."""
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = asyncio.Queue()
+        await queue.put((op, args, kwargs))
+        
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id, queue))
+    
+    async def _drain(self, channel_id: str, queue: asyncio.Queue) -> None:
+        """Run queued sends for one channel in order."""
+        while True:
+            try:
+                op, args, kwargs = await asyncio.wait_for(queue.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                if queue.empty():
+                    # No await between the check and the cleanup, so no enqueue can slip in
+                    self._workers.pop(channel_id, None)
+                    self._queues.pop(channel_id, None)
+                    return
+                continue
+            
+            try:
+                await self._send(channel_id, op, args, kwargs)
+            finally:
+                queue.task_done()
+    
+    async def _send(self, channel_id: str, op: SendOp, args: Tuple, kwargs: Dict) -> None:
+        """Run one send; 429 retries happen inside the Slack client."""
+        try:
+            await op(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Slack send {op.__name__} to {channel_id} failed: {e}")
+    
+    async def shutdown(self, timeout: float = 5.0) -> None:
+        """Give queued sends a chance to finish, then stop every worker."""
+        queues = list(self._queues.values())
+        if queues:
+            try:
+                await asyncio.wait_for(asyncio.gather(*(queue.join() for queue in queues)), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Slack send queue shutdown timed out; dropping unsent messages")
+        
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        
+        self._workers.clear()
+        self._queues.clear()
+
+
+# Global instance
+slack_send_queue = SlackSendQueue()
@@ -2,9 +2,11 @@
 
 import asyncio
 import logging
+import queue
 import sys
 from contextlib import asynccontextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
@@ -19,15 +21,26 @@ from src.models.schemas import SupportMessage
 # Global responder setup (initialized during startup)
 responder_setup_global = None
 
-# Configure logging
+# Configure logging. Loggers only enqueue records; a listener thread does the
+# writing, so a slow stream or file never blocks the event loop.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler('logs/app.log', mode='a') if settings.environment == 'production' else logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+# The listener's handlers apply the real format; the queue handler must only render the message
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('logs/app.log', mode='a') if settings.environment == 'production' else logging.StreamHandler()
-    ]
+    handlers=[_queue_handler]
 )
+log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+log_listener.start()
 logger = logging.getLogger(__name__)
 
 
@@ -39,8 +52,8 @@ async def lifespan(app: FastAPI):
     # Health checks on startup
     try:
         # Initialize new LangGraph workflow system (replaces old multi-agent system)
-        from src.workflows.delve_langgraph_workflow import delve_langgraph_workflow
-        workflow_healthy = await delve_langgraph_workflow.health_check()
+        from src.workflows.delve_langgraph_workflow import get_workflow
+        workflow_healthy = await get_workflow().health_check()
         if not workflow_healthy:
             logger.warning("LangGraph workflow health check failed - will attempt initialization on first request")
         
@@ -54,7 +67,7 @@ async def lifespan(app: FastAPI):
             
             if responder_agent:
                 # Connect responder agent to workflow for handling escalations
-                delve_langgraph_workflow.set_responder_agent(responder_agent)
+                get_workflow().set_responder_agent(responder_agent)
                 logger.info("Responder system initialized and connected to LangGraph workflow")
             else:
                 logger.warning("Responder system initialization failed - falling back to legacy escalations")
@@ -71,6 +84,8 @@ async def lifespan(app: FastAPI):
     
     # Cleanup
     logger.info("Shutting down Slack Support AI Agent...")
+    # Flush queued log records before the process exits
+    log_listener.stop()
 
 
 # Create FastAPI app
@@ -93,9 +108,9 @@ async def health_check():
     """Comprehensive health check endpoint."""
     try:
         # Check new LangGraph workflow system
-        from src.workflows.delve_langgraph_workflow import delve_langgraph_workflow
+        from src.workflows.delve_langgraph_workflow import get_workflow
         
-        workflow_healthy = await delve_langgraph_workflow.health_check()
+        workflow_healthy = await get_workflow().health_check()
         
         health_status = {
             "status": "healthy" if workflow_healthy else "degraded",
@@ -228,10 +243,10 @@ async def process_support_message(message: SupportMessage):
         logger.info(f"Processing support message: {message.message_id}")
         
         # Use new LangGraph workflow system
-        from src.workflows.delve_langgraph_workflow import delve_langgraph_workflow
+        from src.workflows.delve_langgraph_workflow import get_workflow
         
         # Run through LangGraph workflow
-        final_state = await delve_langgraph_workflow.process_message(message)
+        final_state = await get_workflow().process_message(message)
         
         # Log results
         logger.info(
@@ -270,10 +285,10 @@ async def test_message(request: Request):
         )
         
         # Use new LangGraph workflow system
-        from src.workflows.delve_langgraph_workflow import delve_langgraph_workflow
+        from src.workflows.delve_langgraph_workflow import get_workflow
         
         # Process through LangGraph workflow
-        final_state = await delve_langgraph_workflow.process_message(test_message)
+        final_state = await get_workflow().process_message(test_message)
         
         # Return results
         return {
@@ -297,10 +312,10 @@ async def get_stats():
     """Get system statistics."""
     try:
         # Get stats from new LangGraph workflow system
-        from src.workflows.delve_langgraph_workflow import delve_langgraph_workflow
+        from src.workflows.delve_langgraph_workflow import get_workflow
         from src.workflows.langgraph_workflow import langgraph_workflow
         
-        workflow_stats = delve_langgraph_workflow.get_stats()
+        workflow_stats = get_workflow().get_stats()
         langgraph_health = await langgraph_workflow.health_check()
         
         return {
@@ -3,6 +3,8 @@
 import streamlit as st
 import asyncio
 import json
+import threading
+import time
 from datetime import datetime
 import sys
 import os
@@ -43,6 +45,34 @@ def main():
         show_configuration()
 
 
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Start one long-lived event loop in a daemon thread.
+
+    Reusing the loop keeps HTTP client pools in the agents alive between
+    button clicks instead of tearing them down with each asyncio.run().
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="dashboard-event-loop", daemon=True).start()
+    return loop
+
+
+def run_async(coro):
+    """Run a coroutine on the background loop and wait for its result.
+
+    The loop thread is shared by every session, so the coroutine must not
+    call st.*; it returns plain data and the script thread renders it.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
+@st.cache_resource
+def get_workflow() -> ImprovedWorkflow:
+    """Get the workflow instance shared across reruns and sessions."""
+    return ImprovedWorkflow()
+
+
+@st.fragment
 def show_test_agent():
     """Test the AI agent with custom messages."""
     st.header("🧪 Test AI Agent")
@@ -72,51 +102,52 @@ def show_test_agent():
     
     if st.button("🚀 Test Agent", type="primary"):
         if test_message.strip():
-            with st.spinner("Processing message through AI workflow..."):
-                try:
-                    # Test the workflow
-                    result = asyncio.run(test_agent_workflow(test_message, category, urgency))
+            try:
+                result = {}
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.subheader("🤖 Agent Response")
+                    stage = st.empty()
+                    stage.caption("Processing message through AI workflow...")
+                    # Render text as each workflow stage completes instead of after the whole run
+                    st.write_stream(stream_agent_workflow(test_message, category, urgency, result, stage))
+                    stage.empty()
+                
+                if result:
+                    st.success("✅ Agent processed successfully!")
+                    
+                    with col1:
+                        if result.get("sources"):
+                            st.subheader("📚 Sources")
+                            for source in result["sources"]:
+                                st.write(f"• {source}")
                     
-                    if result:
-                        st.success("✅ Agent processed successfully!")
+                    with col2:
+                        st.subheader("📊 Processing Details")
                         
-                        # Display results
-                        col1, col2 = st.columns(2)
+                        st.write(f"**Escalated:** {'Yes' if result['escalated'] else 'No'}")
+                        if result['escalated'] and result.get('escalation_reason'):
+                            st.write(f"**Escalation Reason:** {result['escalation_reason']}")
+                        st.write(f"**Processing Time:** {result['processing_time']:.2f}s" if result["processing_time"] else "N/A")
                         
-                        with col1:
-                            st.subheader("🤖 Agent Response")
-                            st.write(result["final_response"])
-                            
-                            if result.get("sources"):
-                                st.subheader("📚 Sources")
-                                for source in result["sources"]:
-                                    st.write(f"• {source}")
+                        st.write("**Agents Used:**")
+                        for i, agent in enumerate(result["agents_used"]):
+                            confidence = result["confidence_scores"][i] if i < len(result["confidence_scores"]) else 0
+                            st.write(f"• {agent}: {confidence:.2f}")
                         
-                        with col2:
-                            st.subheader("📊 Processing Details")
-                            
-                            st.write(f"**Escalated:** {'Yes' if result['escalated'] else 'No'}")
-                            if result['escalated'] and result.get('escalation_reason'):
-                                st.write(f"**Escalation Reason:** {result['escalation_reason']}")
-                            st.write(f"**Processing Time:** {result['processing_time']:.2f}s" if result["processing_time"] else "N/A")
-                            
-                            st.write("**Agents Used:**")
-                            for i, agent in enumerate(result["agents_used"]):
-                                confidence = result["confidence_scores"][i] if i < len(result["confidence_scores"]) else 0
-                                st.write(f"• {agent}: {confidence:.2f}")
-                            
-                            # Show metadata if available
-                            if result.get('metadata'):
-                                metadata = result['metadata']
-                                if metadata.get('frameworks_detected'):
-                                    st.write(f"**Frameworks Detected:** {', '.join(metadata['frameworks_detected'])}")
-                                if metadata.get('intent_classified'):
-                                    st.write(f"**Intent:** {metadata['intent_classified']}")
-                    
-                except Exception as e:
-                    st.error(f"❌ Error testing agent: {str(e)}")
-                    st.write("**Error details:**")
-                    st.code(str(e))
+                        # Show metadata if available
+                        if result.get('metadata'):
+                            metadata = result['metadata']
+                            if metadata.get('frameworks_detected'):
+                                st.write(f"**Frameworks Detected:** {', '.join(metadata['frameworks_detected'])}")
+                            if metadata.get('intent_classified'):
+                                st.write(f"**Intent:** {metadata['intent_classified']}")
+                
+            except Exception as e:
+                st.error(f"❌ Error testing agent: {str(e)}")
+                st.write("**Error details:**")
+                st.code(str(e))
         else:
             st.warning("⚠️ Please enter a test message.")
     
@@ -138,15 +169,15 @@ def show_test_agent():
         with cols[i % 2]:
             if st.button(f"📝 {example}", key=f"example_{i}"):
                 st.session_state["test_message"] = example
-                st.rerun()
+                st.rerun(scope="fragment")
 
 
-async def test_agent_workflow(message: str, category: str = "Auto-detect", urgency: str = "Auto-detect"):
-    """Test the agent workflow with a message."""
+def stream_agent_workflow(message: str, category: str, urgency: str, result: dict, stage=None):
+    """Yield response text as workflow stages complete, filling ``result`` with the details."""
     try:
         # Initialize RAG system if needed
         if not rag_system.is_initialized:
-            await rag_system.initialize()
+            run_async(rag_system.initialize())
         
         # Create test support message with dashboard flag to disable Slack messaging
         test_message = SupportMessage(
@@ -166,33 +197,49 @@ async def test_agent_workflow(message: str, category: str = "Auto-detect", urgen
         if urgency != "Auto-detect":
             test_message.urgency_level = UrgencyLevel(urgency)
         
-        # Process through improved workflow
-        workflow = ImprovedWorkflow()
-        start_time = datetime.now()
-        state = await workflow.process_message(test_message)
-        processing_time = (datetime.now() - start_time).total_seconds()
+        # Drive the async generator on the background loop one stage at a time
+        workflow = get_workflow()
+        started = time.perf_counter()
+        stream = workflow.stream_message(test_message)
+        responses = []
+        while True:
+            try:
+                response = run_async(stream.__anext__())
+            except StopAsyncIteration:
+                break
+            
+            if response.agent_name == "intake":
+                if stage is not None:
+                    stage.caption("Message received - routing to the best agent...")
+                continue
+            
+            responses.append(response)
+            if response.response_text:
+                yield response.response_text
+        processing_time = time.perf_counter() - started
+        
+        if not responses:
+            yield "No response generated"
+            return
         
-        # Extract best response from state
-        best_response = None
-        if state.agent_responses:
-            best_response = max(state.agent_responses, key=lambda r: r.confidence_score)
+        # Extract best response from the streamed stages
+        best_response = max(responses, key=lambda r: r.confidence_score)
         
-        return {
-            "final_response": state.final_response or "No response generated",
-            "escalated": state.escalated,
-            "agents_used": [r.agent_name for r in state.agent_responses],
-            "confidence_scores": [r.confidence_score for r in state.agent_responses],
+        result.update({
+            "escalated": any(r.should_escalate for r in responses),
+            "agents_used": [r.agent_name for r in responses],
+            "confidence_scores": [r.confidence_score for r in responses],
             "processing_time": processing_time,
-            "sources": best_response.sources if best_response and best_response.sources else [],
-            "escalation_reason": best_response.escalation_reason if best_response else None,
-            "metadata": best_response.metadata if best_response and hasattr(best_response, 'metadata') else {}
-        }
+            "sources": best_response.sources or [],
+            "escalation_reason": best_response.escalation_reason,
+            "metadata": best_response.metadata or {}
+        })
         
     except Exception as e:
         st.error(f"Error in workflow test: {e}")
-        return None
 
 
+@st.fragment
 def show_system_health():
     """Show system health status."""
     st.header("🏥 System Health")
@@ -244,7 +291,7 @@ def show_system_health():
     
     if st.button("🔄 Refresh Health Status"):
         with st.spinner("Checking system health..."):
-            health_status = asyncio.run(check_system_health())
+            health_status = run_async(check_system_health())
             st.session_state.health_status = health_status
     
     # Get health status from session state or use defaults
@@ -278,6 +325,7 @@ def show_system_health():
         st.error(f"Health check error: {health_status['error']}")
 
 
+@st.fragment
 def show_configuration():
     """Show configuration details."""
     st.header("⚙️ Configuration")
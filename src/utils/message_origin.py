@@ -4,7 +4,7 @@ Distinguishes between human agent messages and customer messages in Slack integr
 """
 
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -13,6 +13,13 @@ logger = logging.getLogger(__name__)
 class MessageOriginDetector:
     """Detects the origin of messages to determine routing logic."""
     
+    # Routing table: origin_type -> routing decisions. New origin types only need a row here.
+    _ROUTING_TABLE: Dict[str, Dict[str, bool]] = {
+        "customer_with_human": {"human_channel": True, "customer_platform": False, "disable_ai": False},
+        "human_agent": {"human_channel": False, "customer_platform": True, "disable_ai": True},
+    }
+    _NO_ROUTE: Dict[str, bool] = {"human_channel": False, "customer_platform": False, "disable_ai": False}
+    
     def __init__(self):
         """Initialize message origin detector."""
         self._known_human_agents = {}  # Will be populated from session data
@@ -43,8 +50,11 @@ class MessageOriginDetector:
             if not user_id:
                 return "unknown", None
             
-            # IMPROVED: First check if this user is assigned to ANY session (more reliable)
+            # Fetch assigned sessions once and evaluate both predicates in a single pass.
+            # An assignment match on any session still takes priority over a thread match.
             assigned_sessions = await session_manager.get_sessions_by_state("assigned")
+            lookup_ts = thread_ts or slack_event.get('ts')
+            session_info = None
             
             for session in assigned_sessions:
                 if session.assigned_to == user_id and session.ai_disabled:
@@ -58,13 +68,10 @@ class MessageOriginDetector:
                     }
                     logger.info(f"✅ Detected human agent message from {session.assigned_agent_name} (user {user_id}) for session {session.session_id}")
                     return "human_agent", agent_info
-            
-            # Fallback: Check by thread (original logic)
-            session_info = await self._find_session_by_thread(
-                thread_ts or slack_event.get('ts'), 
-                channel_id, 
-                session_manager
-            )
+                
+                # Fallback: remember the first session tied to this thread
+                if session_info is None and self._session_matches_thread(session, lookup_ts):
+                    session_info = (session.session_id, session)
             
             if session_info:
                 session_id, session = session_info
@@ -100,26 +107,24 @@ class MessageOriginDetector:
         self, 
         thread_ts: str, 
         channel_id: str, 
-        session_manager
+        session_manager,
+        assigned_sessions: Optional[List['ConversationSession']] = None
     ) -> Optional[Tuple[str, 'ConversationSession']]:
-        """Find session associated with a Slack thread."""
+        """Find session associated with a Slack thread.
+        
+        Pass assigned_sessions when the caller already fetched them to avoid a second query.
+        """
         try:
             if not thread_ts:
                 return None
             
             # Get all assigned sessions (human-handled sessions)
-            assigned_sessions = await session_manager.get_sessions_by_state("assigned")
+            if assigned_sessions is None:
+                assigned_sessions = await session_manager.get_sessions_by_state("assigned")
             
             for session in assigned_sessions:
-                # Check if thread_ts matches
-                if session.thread_ts == thread_ts:
+                if self._session_matches_thread(session, thread_ts):
                     return session.session_id, session
-                    
-                # Also check if the thread_ts appears in session history
-                for message in session.history:
-                    if (message.get('thread_ts') == thread_ts or 
-                        message.get('ts') == thread_ts):
-                        return session.session_id, session
             
             return None
             
@@ -127,6 +132,15 @@ class MessageOriginDetector:
             logger.error(f"Error finding session by thread {thread_ts}: {e}")
             return None
     
+    @staticmethod
+    def _session_matches_thread(session, thread_ts: Optional[str]) -> bool:
+        """Check whether a session belongs to the given Slack thread."""
+        if not thread_ts:
+            return False
+        
+        # Constant-time lookup against the session thread and its history index
+        return session.has_thread(thread_ts)
+    
     async def is_customer_message_in_chainlit(
         self, 
         message_content: str, 
@@ -160,18 +174,15 @@ class MessageOriginDetector:
     
     def should_route_to_human_channel(self, origin_type: str) -> bool:
         """Determine if message should be routed to human agent channel."""
-        return origin_type == "customer_with_human"
+        return self._ROUTING_TABLE.get(origin_type, self._NO_ROUTE)["human_channel"]
     
     def should_route_to_customer_platform(self, origin_type: str) -> bool:
         """Determine if message should be routed to customer platform."""
-        return origin_type == "human_agent"
+        return self._ROUTING_TABLE.get(origin_type, self._NO_ROUTE)["customer_platform"]
     
     def should_disable_ai_processing(self, origin_type: str, session_info: Optional[Dict]) -> bool:
         """Determine if AI processing should be disabled."""
-        if origin_type == "human_agent":
+        if self._ROUTING_TABLE.get(origin_type, self._NO_ROUTE)["disable_ai"]:
             return True
         
-        if session_info and session_info.get('ai_disabled'):
-            return True
-            
-        return False
\ No newline at end of file
+        return bool(session_info and session_info.get('ai_disabled'))
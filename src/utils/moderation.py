@@ -36,11 +36,24 @@ class ModerationFilter:
             r'\b(get a quote|pricing quote|custom quote|personalized pricing)\b',
             r'\b(need to speak|want to talk|would like to discuss)\b',
         ]
+        
+        # Fuse all categories into one IGNORECASE alternation with a named group per
+        # category. The lookahead keeps each hit zero-width, so a long match in one
+        # category cannot swallow an overlapping match from another.
+        self._combined_regex = re.compile(
+            "(?=" + "|".join(
+                f"(?P<{category}>{'|'.join(patterns)})"
+                for category, patterns in (
+                    ('hostile', self.hostile_patterns),
+                    ('legal', self.legal_patterns),
+                    ('connection', self.connection_patterns),
+                )
+            ) + ")",
+            re.IGNORECASE
+        )
     
     def analyze_message(self, message: str) -> Dict[str, Any]:
         """Analyze message for moderation and categorization."""
-        content_lower = message.lower().strip()
-        
         result = {
             'is_hostile': False,
             'is_legal_privacy': False,
@@ -50,32 +63,37 @@ class ModerationFilter:
             'suggested_response': None
         }
         
+        # Single pass over the message; record the first hit of each category.
+        # A hostile hit already decides both CTA suppression and escalation, so the
+        # scan stops there and the legal/connection flags are left unset.
+        hits = {}
+        for match in self._combined_regex.finditer(message):
+            category = match.lastgroup
+            if category not in hits:
+                hits[category] = match.group(category)
+                if category == 'hostile' or len(hits) == 3:
+                    break
+        
         # Check for hostile content
-        for pattern in self.hostile_patterns:
-            if re.search(pattern, content_lower):
-                result['is_hostile'] = True
-                result['sentiment'] = 'negative'
-                result['moderation_action'] = 'escalate_politely'
-                result['suggested_response'] = (
-                    "I'm sorry you're having a frustrating experience. "
-                    "Would you like me to connect you with our support team who can help address your concerns?"
-                )
-                logger.info(f"Hostile content detected: {pattern}")
-                break
+        if 'hostile' in hits:
+            result['is_hostile'] = True
+            result['sentiment'] = 'negative'
+            result['moderation_action'] = 'escalate_politely'
+            result['suggested_response'] = (
+                "I'm sorry you're having a frustrating experience. "
+                "Would you like me to connect you with our support team who can help address your concerns?"
+            )
+            logger.info(f"Hostile content detected: {hits['hostile']}")
         
         # Check for legal/privacy queries
-        for pattern in self.legal_patterns:
-            if re.search(pattern, content_lower):
-                result['is_legal_privacy'] = True
-                logger.info(f"Legal/privacy query detected: {pattern}")
-                break
+        if 'legal' in hits:
+            result['is_legal_privacy'] = True
+            logger.info(f"Legal/privacy query detected: {hits['legal']}")
         
         # Check for connection requests (human contact, not demo)
-        for pattern in self.connection_patterns:
-            if re.search(pattern, content_lower):
-                result['is_connection_request'] = True
-                logger.info(f"Connection request detected: {pattern}")
-                break
+        if 'connection' in hits:
+            result['is_connection_request'] = True
+            logger.info(f"Connection request detected: {hits['connection']}")
         
         return result
     
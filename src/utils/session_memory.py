@@ -1,27 +1,34 @@
 """Simple session memory to avoid repeating facts."""
 
+import re
 import time
+import bisect
+import heapq
 import logging
-from typing import Dict, Set, Optional
+import threading
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Sentence terminator plus any trailing whitespace; used to split responses into spans
+_SENTENCE_END_RE = re.compile(r'[.!?]+(?:\s+|$)')
+
 
 @dataclass
 class SessionFacts:
-    """Track facts mentioned in a session."""
-    mentioned_facts: Set[str]
-    last_updated: float
+    """Track facts mentioned in a session as a bitmask of SessionMemory fact bits."""
+    mentioned_mask: int = 0
+    last_updated: float = 0.0
     
-    def add_fact(self, fact: str):
-        """Add a fact to the session memory."""
-        self.mentioned_facts.add(fact.lower().strip())
+    def add_facts(self, fact_mask: int):
+        """Mark every fact in the mask as mentioned."""
+        self.mentioned_mask |= fact_mask
         self.last_updated = time.time()
     
-    def has_mentioned(self, fact: str) -> bool:
-        """Check if a fact was already mentioned."""
-        return fact.lower().strip() in self.mentioned_facts
+    def has_mentioned(self, fact_mask: int) -> bool:
+        """Check if any fact in the mask was already mentioned."""
+        return bool(self.mentioned_mask & fact_mask)
 
 
 class SessionMemory:
@@ -30,6 +37,10 @@ class SessionMemory:
     def __init__(self, session_timeout: int = 3600):  # 1 hour timeout
         self.sessions: Dict[str, SessionFacts] = {}
         self.session_timeout = session_timeout
+        # Min-heap of (expiry, session_id); entries are validated lazily on pop
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # Guards mutations only; lookups rely on dict reads being atomic
+        self._lock = threading.Lock()
         
         # Common facts that get repeated too often
         self.common_facts = {
@@ -41,95 +52,169 @@ class SessionMemory:
             "white glove onboarding": ["white-glove", "white glove", "1:1 expert support"],
             "mit researchers": ["mit ai researchers", "founded by mit", "karun kaushik", "selin kocalar"],
         }
+        
+        # Flattened (pattern, fact_key) pairs compiled into one named-group regex.
+        # The lookahead keeps matches zero-width so overlapping patterns are all seen.
+        self._fact_patterns = [
+            (pattern, fact_key)
+            for fact_key, fact_patterns in self.common_facts.items()
+            for pattern in fact_patterns
+        ]
+        self._fact_regex = re.compile(
+            "(?=" + "|".join(
+                f"(?P<g{i}>{re.escape(pattern)})" for i, (pattern, _) in enumerate(self._fact_patterns)
+            ) + ")",
+            re.IGNORECASE
+        )
+        # Each fact key owns one bit, so a set of hits is a single int
+        self._fact_bit = {fact_key: i for i, fact_key in enumerate(self.common_facts)}
+        self._group_to_mask = {
+            f"g{i}": 1 << self._fact_bit[fact_key] for i, (_, fact_key) in enumerate(self._fact_patterns)
+        }
     
     def get_session(self, session_id: str) -> SessionFacts:
         """Get or create session facts."""
         # Clean up expired sessions
         self._cleanup_expired_sessions()
         
-        if session_id not in self.sessions:
-            self.sessions[session_id] = SessionFacts(
-                mentioned_facts=set(),
-                last_updated=time.time()
-            )
+        session = self.sessions.get(session_id)
+        if session is None:
+            with self._lock:
+                # Re-check under the lock in case another thread created it first
+                session = self.sessions.get(session_id)
+                if session is None:
+                    now = time.time()
+                    session = self.sessions[session_id] = SessionFacts(last_updated=now)
+                    heapq.heappush(self._expiry_heap, (now + self.session_timeout, session_id))
         
-        return self.sessions[session_id]
+        return session
+    
+    def _find_fact_hits(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> int:
+        """Return a bitmask of the facts whose patterns appear in text[pos:endpos]."""
+        hits = 0
+        for match in self._fact_regex.finditer(text, pos, len(text) if endpos is None else endpos):
+            hits |= self._group_to_mask[match.lastgroup]
+        return hits
+    
+    def _fact_names(self, fact_mask: int) -> List[str]:
+        """Translate a fact bitmask back into fact keys for logging."""
+        return [fact_key for fact_key, bit in self._fact_bit.items() if fact_mask >> bit & 1]
     
     def should_suppress_fact(self, session_id: str, response_text: str) -> bool:
         """Check if common facts should be suppressed to avoid repetition."""
         session = self.get_session(session_id)
-        response_lower = response_text.lower()
+        repeated = self._find_fact_hits(response_text) & session.mentioned_mask
         
-        for fact_key, fact_patterns in self.common_facts.items():
-            # Check if this fact is in the response
-            fact_in_response = any(pattern in response_lower for pattern in fact_patterns)
-            
-            if fact_in_response and session.has_mentioned(fact_key):
-                logger.info(f"Suppressing repeated fact: {fact_key}")
-                return True
+        if repeated:
+            logger.info(f"Suppressing repeated facts: {', '.join(self._fact_names(repeated))}")
+            return True
         
         return False
     
     def record_response_facts(self, session_id: str, response_text: str):
         """Record facts mentioned in a response."""
         session = self.get_session(session_id)
-        response_lower = response_text.lower()
+        hits = self._find_fact_hits(response_text)
         
-        for fact_key, fact_patterns in self.common_facts.items():
-            # Check if this fact is in the response
-            fact_in_response = any(pattern in response_lower for pattern in fact_patterns)
-            
-            if fact_in_response:
-                session.add_fact(fact_key)
-                logger.debug(f"Recorded fact in session {session_id}: {fact_key}")
+        if hits:
+            with self._lock:
+                session.add_facts(hits)
+            logger.debug(f"Recorded facts in session {session_id}: {', '.join(self._fact_names(hits))}")
     
-    def suppress_repetitive_facts(self, session_id: str, response_text: str) -> str:
-        """Remove repetitive facts from response text."""
-        if self.should_suppress_fact(session_id, response_text):
-            # Simple approach: remove sentences with repeated facts
-            sentences = response_text.split('. ')
-            filtered_sentences = []
-            
-            for sentence in sentences:
-                sentence_lower = sentence.lower()
-                should_keep = True
-                
-                for fact_key, fact_patterns in self.common_facts.items():
-                    if self.get_session(session_id).has_mentioned(fact_key):
-                        # If this fact was mentioned before and appears in this sentence
-                        if any(pattern in sentence_lower for pattern in fact_patterns):
-                            should_keep = False
-                            logger.debug(f"Removing repetitive sentence: {sentence[:50]}...")
-                            break
-                
-                if should_keep:
-                    filtered_sentences.append(sentence)
-            
-            filtered_response = '. '.join(filtered_sentences)
-            
-            # Clean up any double periods or trailing issues
-            filtered_response = filtered_response.replace('..', '.').strip()
-            if filtered_response and not filtered_response.endswith('.'):
-                filtered_response += '.'
-            
-            # Record the facts from the original response (before filtering)
-            self.record_response_facts(session_id, response_text)
-            
-            return filtered_response
-        else:
-            # Record facts for future suppression
-            self.record_response_facts(session_id, response_text)
+    def process_response(self, session_id: str, response_text: str) -> str:
+        """
+        Drop sentences repeating facts already mentioned in the session and record new ones.
+        
+        One regex pass over the response yields every fact hit with its offset;
+        the same hits decide which sentences to drop and what to record.
+        """
+        session = self.get_session(session_id)
+        mentioned = session.mentioned_mask
+        
+        hits = 0
+        match_hits = []
+        for match in self._fact_regex.finditer(response_text):
+            fact_mask = self._group_to_mask[match.lastgroup]
+            hits |= fact_mask
+            match_hits.append((match.start(), fact_mask))
+        
+        if not hits:
             return response_text
+        
+        # Record the facts from the original response (before filtering)
+        with self._lock:
+            session.add_facts(hits)
+        logger.debug(f"Recorded facts in session {session_id}: {', '.join(self._fact_names(hits))}")
+        
+        repeated = hits & mentioned
+        if not repeated:
+            return response_text
+        
+        logger.info(f"Suppressing repeated facts: {', '.join(self._fact_names(repeated))}")
+        
+        # Map each repeated hit to the sentence containing it
+        spans = self._sentence_spans(response_text)
+        span_starts = [start for start, _ in spans]
+        dropped = {
+            bisect.bisect_right(span_starts, offset) - 1
+            for offset, fact_mask in match_hits if fact_mask & mentioned
+        }
+        
+        keep_ranges = []
+        for index, (start, end) in enumerate(spans):
+            if index in dropped:
+                logger.debug(f"Removing repetitive sentence: {response_text[start:start + 50]}...")
+                continue
+            keep_ranges.append((start, end))
+        
+        # Surviving sentences keep their own punctuation, so stitching needs no cleanup pass
+        filtered_response = ''.join(response_text[start:end] for start, end in keep_ranges).rstrip()
+        if filtered_response and filtered_response[-1] not in '.!?':
+            filtered_response += '.'
+        
+        return filtered_response
+    
+    def suppress_repetitive_facts(self, session_id: str, response_text: str) -> str:
+        """Remove repetitive facts from response text. Kept for callers of the old API."""
+        return self.process_response(session_id, response_text)
+    
+    @staticmethod
+    def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+        """Split text into (start, end) sentence spans, each including its terminator."""
+        spans = []
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(text):
+            spans.append((start, match.end()))
+            start = match.end()
+        if start < len(text):
+            spans.append((start, len(text)))
+        return spans
     
     def _cleanup_expired_sessions(self):
-        """Remove expired sessions."""
+        """Remove expired sessions by popping due entries off the expiry heap."""
         current_time = time.time()
-        expired_sessions = [
-            session_id for session_id, session_facts in self.sessions.items()
-            if current_time - session_facts.last_updated > self.session_timeout
-        ]
+        heap = self._expiry_heap
+        if not heap or heap[0][0] > current_time:
+            return
         
-        for session_id in expired_sessions:
+        with self._lock:
+            self._pop_expired_sessions(current_time)
+    
+    def _pop_expired_sessions(self, current_time: float):
+        """Pop due heap entries and delete sessions that really expired. Caller holds the lock."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= current_time:
+            _, session_id = heapq.heappop(heap)
+            session_facts = self.sessions.get(session_id)
+            if session_facts is None:
+                continue
+            
+            expires_at = session_facts.last_updated + self.session_timeout
+            if expires_at > current_time:
+                # Session was touched since this entry was pushed; reschedule it
+                heapq.heappush(heap, (expires_at, session_id))
+                continue
+            
             del self.sessions[session_id]
             logger.debug(f"Cleaned up expired session: {session_id}")
 
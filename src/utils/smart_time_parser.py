@@ -5,34 +5,112 @@ Falls back to traditional parsers for simple cases.
 
 import json
 import logging
+import time
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
-import pytz
+from typing import Dict, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
 import dateparser
 import re
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import instead of on every parse
+_RE_TOMORROW = re.compile(r'\btomorrow\b')
+_RE_TODAY = re.compile(r'\btoday\b')
+_RE_YESTERDAY = re.compile(r'\byesterday\b')
+_RE_IN_DAYS_WORD = re.compile(r'\bin (\d+) days?\b')
+_RE_IN_WEEKS_WORD = re.compile(r'\bin (\d+) weeks?\b')
+_RE_IN_DAYS = re.compile(r'in (\d+) days?')
+_RE_IN_WEEKS = re.compile(r'in (\d+) weeks?')
+_RE_TIME = re.compile(r'(\d{1,2})\s*(am|pm)')
+
+# "next Tuesday", "this Friday", "last Monday", "end of week", "beginning of month", "middle of next week"
+_RE_COMPLEX = re.compile(
+    r'\b(?:(?:next|this|last)\s+\w+day|end of\s+\w+|beginning of\s+\w+|middle of\s+\w+)\b'
+)
+
+_TIMEZONE_MAP = {
+    'est': 'America/New_York', 'eastern': 'America/New_York', 'et': 'America/New_York',
+    'pst': 'America/Los_Angeles', 'pacific': 'America/Los_Angeles', 'pt': 'America/Los_Angeles',
+    'cst': 'America/Chicago', 'central': 'America/Chicago', 'ct': 'America/Chicago',
+    'mst': 'America/Denver', 'mountain': 'America/Denver', 'mt': 'America/Denver',
+    'utc': 'UTC', 'gmt': 'GMT'
+}
+
+# Levels are listed from highest to lowest priority; the first level with a hit wins
+_URGENCY_KEYWORDS = [
+    ('high', ['urgent', 'asap', 'immediately', 'emergency', 'critical']),
+    ('medium', ['soon', 'quickly', 'today', 'tomorrow']),
+    ('low', ['later', 'whenever', 'no rush', 'flexible']),
+]
+_FLEXIBILITY_KEYWORDS = [
+    ('strict', ['exactly', 'specifically', 'must be', 'only']),
+    ('flexible', ['around', 'roughly', 'approximately', 'about']),
+    ('very_flexible', ['anytime', 'whenever', 'flexible', 'open']),
+]
+
+
+def _build_context_regex():
+    """Fuse timezone, urgency and flexibility keywords into one named-group regex."""
+    payloads = {}
+    for priority, (tz_abbr, tz_full) in enumerate(_TIMEZONE_MAP.items()):
+        payloads.setdefault(r'\b' + re.escape(tz_abbr) + r'\b', []).append(('timezone', tz_full, priority))
+    for field, levels in (('urgency', _URGENCY_KEYWORDS), ('flexibility', _FLEXIBILITY_KEYWORDS)):
+        for priority, (value, words) in enumerate(levels):
+            for word in words:
+                payloads.setdefault(re.escape(word), []).append((field, value, priority))
+    
+    groups = list(payloads.items())
+    # Zero-width lookahead so keywords inside or overlapping other keywords are still seen
+    regex = re.compile("(?=" + "|".join(f"(?P<k{i}>{pattern})" for i, (pattern, _) in enumerate(groups)) + ")")
+    return regex, {f"k{i}": hits for i, (_, hits) in enumerate(groups)}
+
+
+_RE_CONTEXT, _CONTEXT_PAYLOADS = _build_context_regex()
+
+
+@lru_cache(maxsize=None)
+def _tz(name: str) -> ZoneInfo:
+    """Return a shared ZoneInfo instance for a timezone name."""
+    return ZoneInfo(name)
+
+
+def _parse_with_dateparser(text: str, tz_name: str) -> Optional[datetime]:
+    """Run dateparser restricted to English and the parsers we actually need."""
+    return dateparser.parse(text, languages=['en'], settings={
+        'PREFER_DATES_FROM': 'future',
+        'RETURN_AS_TIMEZONE_AWARE': True,
+        'TIMEZONE': tz_name,
+        'PARSERS': ['absolute-time', 'relative-time', 'timestamp']
+    })
+
 
 class SmartTimeParser:
     """Intelligent time parser using LLM for complex natural language expressions."""
     
     def __init__(self, default_timezone: str = "America/New_York"):
-        self.default_tz = pytz.timezone(default_timezone)
+        self.default_tz = _tz(default_timezone)
         
         # Simple patterns that don't need LLM
         self.simple_patterns = {
-            r'\btomorrow\b': self._parse_tomorrow,
-            r'\btoday\b': self._parse_today, 
-            r'\byesterday\b': self._parse_yesterday,
-            r'\bin (\d+) days?\b': self._parse_in_days,
-            r'\bin (\d+) weeks?\b': self._parse_in_weeks,
+            _RE_TOMORROW: self._parse_tomorrow,
+            _RE_TODAY: self._parse_today,
+            _RE_YESTERDAY: self._parse_yesterday,
+            _RE_IN_DAYS_WORD: self._parse_in_days,
+            _RE_IN_WEEKS_WORD: self._parse_in_weeks,
         }
+        
+        # Per-instance memo of deterministic parses; a class-level lru_cache would keep every parser alive
+        self._parse_deterministic_cached = lru_cache(maxsize=2048)(self._resolve_deterministic)
     
     async def parse_time_expression(self, text: str) -> Dict[str, Union[datetime, str, None]]:
         """
         Parse natural language time expression intelligently.
         
+        Only awaits the LLM when neither simple patterns nor dateparser
+        produced a datetime and the text looks like a complex expression.
+        
         Args:
             text: Natural language text containing time expressions
             
@@ -40,66 +118,72 @@ class SmartTimeParser:
             Dict with parsed time information
         """
         text_lower = text.lower()
+        result = self._parse_deterministic(text_lower)
         
-        result = {
-            'preferred_datetime': None,
+        try:
+            # Step 3: Use LLM for complex cases (like "next Tuesday") the fast paths missed
+            if result['preferred_datetime'] is None and self._needs_llm_parsing(text_lower):
+                llm_result = await self._parse_with_llm(text)
+                if llm_result and llm_result.get('target_date'):
+                    result.update(llm_result)
+                    result['parsing_method'] = 'llm'
+            
+            # Extract additional context
+            result.update(self._extract_context(text_lower))
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error parsing time expression '{text}': {e}")
+            return result
+    
+    def _parse_deterministic(self, text_lower: str) -> Dict[str, Union[datetime, str, None]]:
+        """Run the simple-pattern and dateparser steps, memoized per text and minute."""
+        preferred_datetime, parsing_method = self._parse_deterministic_cached(
+            text_lower, int(time.time() // 60)
+        )
+        return {
+            'preferred_datetime': preferred_datetime,
             'date_range': None,
             'time_preference': None,
             'timezone': None,
             'urgency': 'medium',
             'flexibility': 'flexible',
-            'parsing_method': 'unknown'
+            'parsing_method': parsing_method
         }
+    
+    def _resolve_deterministic(self, text_lower: str, minute_bucket: int) -> Tuple[Optional[datetime], str]:
+        """
+        Resolve text to (datetime, parsing_method) without the LLM.
         
+        minute_bucket is part of the cache key so relative phrases like
+        "tomorrow" roll over naturally as time moves on.
+        """
         try:
             # Step 1: Try simple patterns first (fast)
             for pattern, parser_func in self.simple_patterns.items():
-                if re.search(pattern, text_lower):
-                    result['preferred_datetime'] = parser_func(text_lower)
-                    result['parsing_method'] = 'simple_pattern'
-                    if result['preferred_datetime']:
-                        break
-            
-            # Step 2: Try dateparser for standard expressions
-            if not result['preferred_datetime']:
-                parsed_dt = dateparser.parse(text, settings={
-                    'PREFER_DATES_FROM': 'future',
-                    'RETURN_AS_TIMEZONE_AWARE': True,
-                    'TIMEZONE': str(self.default_tz)
-                })
-                if parsed_dt:
-                    result['preferred_datetime'] = parsed_dt
-                    result['parsing_method'] = 'dateparser'
-            
-            # Step 3: Use LLM for complex cases (like "next Tuesday")
-            if not result['preferred_datetime'] or self._needs_llm_parsing(text_lower):
-                llm_result = await self._parse_with_llm(text)
-                if llm_result and llm_result.get('target_date'):
-                    result.update(llm_result)
-                    result['parsing_method'] = 'llm'
+                if pattern.search(text_lower):
+                    parsed_dt = parser_func(text_lower)
+                    if parsed_dt is not None:
+                        return parsed_dt, 'simple_pattern'
             
-            # Extract additional context
-            result['timezone'] = self._extract_timezone(text_lower)
-            result['urgency'] = self._extract_urgency(text_lower)
-            result['flexibility'] = self._extract_flexibility(text_lower)
+            # Complex expressions are left to the LLM; dateparser tends to misread them anyway
+            if self._needs_llm_parsing(text_lower):
+                return None, 'unknown'
             
-            return result
+            # Step 2: Try dateparser for standard expressions
+            parsed_dt = _parse_with_dateparser(text_lower, str(self.default_tz))
+            if parsed_dt:
+                return parsed_dt, 'dateparser'
             
         except Exception as e:
-            logger.error(f"Error parsing time expression '{text}': {e}")
-            return result
+            logger.error(f"Error parsing time expression '{text_lower}': {e}")
+        
+        return None, 'unknown'
     
     def _needs_llm_parsing(self, text: str) -> bool:
         """Check if text needs LLM parsing due to complexity."""
-        complex_patterns = [
-            r'\b(next|this)\s+\w+day\b',  # "next Tuesday", "this Friday"
-            r'\blast\s+\w+day\b',         # "last Monday"
-            r'\bend of\s+\w+\b',          # "end of week"
-            r'\bbeginning of\s+\w+\b',    # "beginning of month"
-            r'\bmiddle of\s+\w+\b',       # "middle of next week"
-        ]
-        
-        return any(re.search(pattern, text) for pattern in complex_patterns)
+        return _RE_COMPLEX.search(text) is not None
     
     async def _parse_with_llm(self, text: str) -> Optional[Dict]:
         """Use LLM to parse complex time expressions."""
@@ -143,10 +227,11 @@ Return JSON format:
             if response and response.strip():
                 # Clean up response (remove markdown if present)
                 json_text = response.strip()
-                if json_text.startswith('```json'):
-                    json_text = json_text.split('```json')[1].split('```')[0].strip()
-                elif json_text.startswith('```'):
-                    json_text = json_text.split('```')[1].split('```')[0].strip()
+                if json_text.startswith('```'):
+                    json_text = json_text[3:]
+                    if json_text.startswith('json'):
+                        json_text = json_text[4:]
+                    json_text = json_text.partition('```')[0].strip()
                 
                 result = json.loads(json_text)
                 
@@ -157,8 +242,7 @@ Return JSON format:
                     
                     # Apply timezone
                     tz_str = result.get('timezone', 'America/New_York')
-                    target_tz = pytz.timezone(tz_str)
-                    target_dt = target_tz.localize(target_dt)
+                    target_dt = target_dt.replace(tzinfo=_tz(tz_str))
                     
                     result['preferred_datetime'] = target_dt
                     return result
@@ -168,47 +252,40 @@ Return JSON format:
         
         return None
     
+    def _extract_hour(self, text: str) -> Optional[int]:
+        """Extract a 24-hour clock hour from an '3pm' / '11 am' style mention."""
+        time_match = _RE_TIME.search(text)
+        if not time_match:
+            return None
+        
+        hour = int(time_match.group(1)) % 12
+        if time_match.group(2) == 'pm':
+            hour += 12
+        return hour
+    
+    def _apply_time(self, dt: datetime, text: str, default_hour: int = 10) -> datetime:
+        """Set the hour mentioned in text on dt, or default_hour if none is given."""
+        hour = self._extract_hour(text)
+        return dt.replace(
+            hour=default_hour if hour is None else hour, minute=0, second=0, microsecond=0
+        )
+    
     def _parse_tomorrow(self, text: str) -> datetime:
         """Parse 'tomorrow' expressions."""
-        tomorrow = datetime.now(self.default_tz) + timedelta(days=1)
-        
-        # Extract time if present
-        time_match = re.search(r'(\d{1,2})\s*(am|pm)', text)
-        if time_match:
-            hour = int(time_match.group(1))
-            am_pm = time_match.group(2)
-            if am_pm == 'pm' and hour != 12:
-                hour += 12
-            elif am_pm == 'am' and hour == 12:
-                hour = 0
-            tomorrow = tomorrow.replace(hour=hour, minute=0, second=0, microsecond=0)
-        else:
-            tomorrow = tomorrow.replace(hour=10, minute=0, second=0, microsecond=0)
-            
-        return tomorrow
+        return self._apply_time(datetime.now(self.default_tz) + timedelta(days=1), text)
     
     def _parse_today(self, text: str) -> datetime:
         """Parse 'today' expressions.""" 
         today = datetime.now(self.default_tz)
         
-        # Extract time if present
-        time_match = re.search(r'(\d{1,2})\s*(am|pm)', text)
-        if time_match:
-            hour = int(time_match.group(1))
-            am_pm = time_match.group(2)
-            if am_pm == 'pm' and hour != 12:
-                hour += 12
-            elif am_pm == 'am' and hour == 12:
-                hour = 0
-            today = today.replace(hour=hour, minute=0, second=0, microsecond=0)
-        else:
-            # Default to next business hour if current time has passed
-            if today.hour >= 17:  # After 5 PM
-                today = today.replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
-            else:
-                today = today.replace(minute=0, second=0, microsecond=0)
+        hour = self._extract_hour(text)
+        if hour is not None:
+            return today.replace(hour=hour, minute=0, second=0, microsecond=0)
         
-        return today
+        # Default to next business hour if current time has passed
+        if today.hour >= 17:  # After 5 PM
+            return today.replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        return today.replace(minute=0, second=0, microsecond=0)
     
     def _parse_yesterday(self, text: str) -> datetime:
         """Parse 'yesterday' expressions (usually not useful for scheduling)."""
@@ -216,56 +293,33 @@ Return JSON format:
     
     def _parse_in_days(self, text: str) -> datetime:
         """Parse 'in X days' expressions."""
-        match = re.search(r'in (\d+) days?', text)
+        match = _RE_IN_DAYS.search(text)
         if match:
             days = int(match.group(1))
-            target = datetime.now(self.default_tz) + timedelta(days=days)
-            return target.replace(hour=10, minute=0, second=0, microsecond=0)
+            return self._apply_time(datetime.now(self.default_tz) + timedelta(days=days), text)
         return None
     
     def _parse_in_weeks(self, text: str) -> datetime:
         """Parse 'in X weeks' expressions."""
-        match = re.search(r'in (\d+) weeks?', text)
+        match = _RE_IN_WEEKS.search(text)
         if match:
             weeks = int(match.group(1))
-            target = datetime.now(self.default_tz) + timedelta(weeks=weeks)
-            return target.replace(hour=10, minute=0, second=0, microsecond=0)
+            return self._apply_time(datetime.now(self.default_tz) + timedelta(weeks=weeks), text)
         return None
     
-    def _extract_timezone(self, text: str) -> Optional[str]:
-        """Extract timezone from text."""
-        timezone_map = {
-            'est': 'America/New_York', 'eastern': 'America/New_York', 'et': 'America/New_York',
-            'pst': 'America/Los_Angeles', 'pacific': 'America/Los_Angeles', 'pt': 'America/Los_Angeles',
-            'cst': 'America/Chicago', 'central': 'America/Chicago', 'ct': 'America/Chicago',
-            'mst': 'America/Denver', 'mountain': 'America/Denver', 'mt': 'America/Denver',
-            'utc': 'UTC', 'gmt': 'GMT'
-        }
+    def _extract_context(self, text: str) -> Dict[str, Optional[str]]:
+        """Extract timezone, urgency and flexibility from lowercased text in one scan."""
+        best = {}
+        for match in _RE_CONTEXT.finditer(text):
+            for field, value, priority in _CONTEXT_PAYLOADS[match.lastgroup]:
+                if field not in best or priority < best[field][1]:
+                    best[field] = (value, priority)
         
-        for tz_abbr, tz_full in timezone_map.items():
-            if re.search(r'\b' + re.escape(tz_abbr) + r'\b', text, re.IGNORECASE):
-                return tz_full
-        return None
-    
-    def _extract_urgency(self, text: str) -> str:
-        """Extract urgency level from text."""
-        if any(word in text for word in ['urgent', 'asap', 'immediately', 'emergency', 'critical']):
-            return 'high'
-        elif any(word in text for word in ['soon', 'quickly', 'today', 'tomorrow']):
-            return 'medium'
-        elif any(word in text for word in ['later', 'whenever', 'no rush', 'flexible']):
-            return 'low'
-        return 'medium'
-    
-    def _extract_flexibility(self, text: str) -> str:
-        """Extract flexibility level from text."""
-        if any(word in text for word in ['exactly', 'specifically', 'must be', 'only']):
-            return 'strict'
-        elif any(word in text for word in ['around', 'roughly', 'approximately', 'about']):
-            return 'flexible'
-        elif any(word in text for word in ['anytime', 'whenever', 'flexible', 'open']):
-            return 'very_flexible'
-        return 'flexible'
+        return {
+            'timezone': best['timezone'][0] if 'timezone' in best else None,
+            'urgency': best['urgency'][0] if 'urgency' in best else 'medium',
+            'flexibility': best['flexibility'][0] if 'flexibility' in best else 'flexible',
+        }
 
 
 # Global instance
@@ -4,72 +4,255 @@ Converts human expressions like 'next week', '2pm PST', 'Friday morning' into sp
 """
 
 import re
+import time as _time
+import calendar
 import logging
-from datetime import datetime, timedelta, time
-from typing import Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from types import MappingProxyType
+from datetime import date, datetime, timedelta, time
+from typing import Any, Dict, List, Optional, Tuple, Union
 import pytz
 from dateutil import parser as dateutil_parser
-from dateutil.relativedelta import relativedelta
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _tz(name: str):
+    """Return a cached pytz timezone; pytz.timezone walks its registry on every call."""
+    return pytz.timezone(name)
+
+
+# Lookup tables and keyword patterns are built once at import and shared read-only
+
+# Common timezone mappings
+_TIMEZONE_MAP = MappingProxyType({
+    'est': 'America/New_York',
+    'eastern': 'America/New_York',
+    'et': 'America/New_York',
+    'pst': 'America/Los_Angeles',
+    'pacific': 'America/Los_Angeles',
+    'pt': 'America/Los_Angeles',
+    'cst': 'America/Chicago',
+    'central': 'America/Chicago',
+    'ct': 'America/Chicago',
+    'mst': 'America/Denver',
+    'mountain': 'America/Denver',
+    'mt': 'America/Denver',
+    'utc': 'UTC',
+    'gmt': 'GMT'
+})
+
+
+# Location-based timezone hints
+_LOCATION_TZ_MAP = MappingProxyType({
+    'california': 'America/Los_Angeles',
+    'west coast': 'America/Los_Angeles',
+    'los angeles': 'America/Los_Angeles',
+    'san francisco': 'America/Los_Angeles',
+    'seattle': 'America/Los_Angeles',
+    'portland': 'America/Los_Angeles',
+    'vegas': 'America/Los_Angeles',
+    
+    'london': 'GMT',
+    'uk': 'GMT',
+    'britain': 'GMT',
+    'england': 'GMT',
+    'scotland': 'GMT',
+    'ireland': 'GMT',
+    
+    'chicago': 'America/Chicago',
+    'texas': 'America/Chicago',
+    'dallas': 'America/Chicago',
+    'houston': 'America/Chicago',
+    'milwaukee': 'America/Chicago',
+    'minneapolis': 'America/Chicago',
+    
+    'denver': 'America/Denver',
+    'colorado': 'America/Denver',
+    'utah': 'America/Denver',
+    'arizona': 'America/Denver',
+    'phoenix': 'America/Denver',
+    
+    'new york': 'America/New_York',
+    'nyc': 'America/New_York',
+    'boston': 'America/New_York',
+    'washington': 'America/New_York',
+    'atlanta': 'America/New_York',
+    'miami': 'America/New_York',
+    'philadelphia': 'America/New_York',
+    'toronto': 'America/New_York',
+    'montreal': 'America/New_York'
+})
+
+
+# Timezone info mapping for dateutil parser to eliminate warnings
+_TZINFOS = MappingProxyType({
+    'EST': _tz('America/New_York'),
+    'PST': _tz('America/Los_Angeles'),
+    'CST': _tz('America/Chicago'),
+    'MST': _tz('America/Denver'),
+    'EDT': _tz('America/New_York'),  # Daylight time
+    'PDT': _tz('America/Los_Angeles'),
+    'CDT': _tz('America/Chicago'),
+    'MDT': _tz('America/Denver')
+})
+
+# Abbreviations shown to users; daylight variants collapse onto the zone's usual name
+_TZ_DISPLAY = MappingProxyType({
+    'EST': 'EST', 'EDT': 'EST',
+    'PST': 'PST', 'PDT': 'PST',
+    'CST': 'CST', 'CDT': 'CST',
+    'MST': 'MST', 'MDT': 'MST',
+    'UTC': 'UTC', 'GMT': 'UTC'
+})
+
+# Display abbreviation per (zone name, UTC offset), filled as slots are formatted
+_TZ_ABBREVIATIONS: Dict[Tuple[str, timedelta], str] = {}
+
+# English names for _format_datetime, matching strftime's %A and %B in the C locale
+_WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December')
+
+# Day of week mappings
+_DAY_NAMES = MappingProxyType({
+    'monday': 0, 'mon': 0,
+    'tuesday': 1, 'tue': 1, 'tues': 1,
+    'wednesday': 2, 'wed': 2,
+    'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
+    'friday': 4, 'fri': 4,
+    'saturday': 5, 'sat': 5,
+    'sunday': 6, 'sun': 6
+})
+
+# Time of day mappings
+_TIME_PERIODS = MappingProxyType({
+    'morning': (9, 12),
+    'afternoon': (13, 17),
+    'evening': (17, 20),
+    'night': (20, 23)
+})
+
+# Weekday jump tables indexed [current_weekday][target_weekday], in days
+# Next occurrence of the target, 0 when it is today
+_DAYS_UNTIL = tuple(tuple((t - c) % 7 for t in range(7)) for c in range(7))
+# Next occurrence of the target, where today rolls over to the same day next week
+_DAYS_UNTIL_NEXT = tuple(tuple((t - c) % 7 or 7 for t in range(7)) for c in range(7))
+# "next <day>": the target's occurrence in the following week
+_DAYS_UNTIL_NEXT_WEEK = tuple(tuple((t - c) % 7 + 7 if (t - c) % 7 else 7 for t in range(7)) for c in range(7))
+
+# Levels are listed from highest to lowest priority; the first level with a hit wins
+_URGENCY_KEYWORDS = (
+    ('high', ('urgent', 'asap', 'immediately', 'emergency', 'critical')),
+    ('medium', ('soon', 'quickly', 'today', 'tomorrow')),
+    ('low', ('later', 'whenever', 'no rush', 'flexible')),
+)
+_FLEXIBILITY_KEYWORDS = (
+    ('strict', ('exactly', 'specifically', 'must be', 'only')),
+    ('flexible', ('around', 'roughly', 'approximately', 'about')),
+    ('very_flexible', ('anytime', 'whenever', 'flexible', 'open')),
+)
+
+# Shape of every parse_time_expression result; copied per parse, never mutated
+_DEFAULT_RESULT = MappingProxyType({
+    'preferred_datetime': None,
+    'date_range': None,
+    'time_preference': None,
+    'timezone': None,
+    'urgency': 'medium',
+    'flexibility': 'flexible'
+})
+
+# Any of these means _parse_relative_time may find a date range
+_RELATIVE_KEYWORDS = ('next week', 'this week', 'tomorrow', 'today', 'next month') + tuple(_DAY_NAMES)
+
+
+def _build_keyword_scanner():
+    """Fuse every keyword category into one named-group regex plus a payload table."""
+    payloads = {}
+    
+    def add(pattern, category, value, priority=0):
+        payloads.setdefault(pattern, []).append((category, value, priority))
+    
+    # Timezones and locations are listed first so a keyword that is a prefix of a
+    # location ('mon' / 'montreal') never hides the location match
+    for tz_abbr, tz_full in _TIMEZONE_MAP.items():
+        add(r'\b' + re.escape(tz_abbr) + r'\b', 'timezone', tz_full)
+    for location, tz_full in _LOCATION_TZ_MAP.items():
+        add(r'\b' + re.escape(location) + r'\b', 'location', tz_full)
+    for category, levels in (('urgency', _URGENCY_KEYWORDS), ('flexibility', _FLEXIBILITY_KEYWORDS)):
+        for priority, (level, words) in enumerate(levels):
+            for word in words:
+                add(re.escape(word), category, level, priority)
+    for period in _TIME_PERIODS:
+        add(period, 'time_period', period)
+    for keyword in _RELATIVE_KEYWORDS:
+        add(re.escape(keyword), 'relative', True)
+    
+    groups = list(payloads.items())
+    # Zero-width lookahead so overlapping keywords are all reported, like the old substring checks
+    regex = re.compile("(?=" + "|".join(f"(?P<k{i}>{pattern})" for i, (pattern, _) in enumerate(groups)) + ")")
+    return regex, {f"k{i}": hits for i, (_, hits) in enumerate(groups)}
+
+
+_RE_KEYWORDS, _KEYWORD_PAYLOADS = _build_keyword_scanner()
+
+
+def _format_datetime(dt: datetime) -> str:
+    """Render dt like strftime('%A, %B %d at %I:%M %p') from its integer fields."""
+    hour = dt.hour
+    return (
+        f"{_WEEKDAY_NAMES[dt.weekday()]}, {_MONTH_NAMES[dt.month - 1]} {dt.day:02d} "
+        f"at {hour % 12 or 12:02d}:{dt.minute:02d} {'AM' if hour < 12 else 'PM'}"
+    )
+
+
+# Manual datetime forms as (group name, pattern, TimeParser handler name); at a
+# given position earlier forms win, so "next tuesday at 2pm" beats "next tuesday"
+_SPECIFIC_FORMS = (
+    # "next tuesday at 2pm", "this friday at 10am"
+    ('rel_day_time', r'(next|this)\s+(\w+day)\s+at\s+(\d{1,2})\s*(am|pm)', '_parse_relative_day_time'),
+    # "tomorrow at 2pm", "friday at 10am"
+    ('day_time', r'(tomorrow|today|\w+day)\s+at\s+(\d{1,2})\s*(am|pm)', '_parse_day_time'),
+    # "next friday", "this monday"
+    ('rel_day', r'(next|this)\s+(\w+day)', '_parse_relative_day'),
+    # "2pm tomorrow", "10am friday"
+    ('time_day', r'(\d{1,2})\s*(am|pm)\s+(tomorrow|today|\w+day)', '_parse_time_day'),
+)
+
+
+def _build_specific_scanner():
+    """Fuse the manual datetime forms into one alternation plus a dispatch table."""
+    regex = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern, _ in _SPECIFIC_FORMS))
+    # Group name -> (first inner group, one past the last inner group, handler name)
+    dispatch = {}
+    for name, pattern, handler in _SPECIFIC_FORMS:
+        first = regex.groupindex[name] + 1
+        dispatch[name] = (first, first + re.compile(pattern).groups, handler)
+    return regex, dispatch
+
+
+_RE_SPECIFIC, _SPECIFIC_DISPATCH = _build_specific_scanner()
+
+
 class TimeParser:
     """Parses natural language time expressions into structured datetime objects."""
     
+    # Patterns used by _parse_specific_datetime, compiled once for all instances
+    _PAT_NEXT_THIS_DAY = re.compile(r'\b(next|this)\s+\w*day')
+    # Whole-message fast path: "[next|this] <day> [at] H[:MM][am|pm] [tz]"
+    _PAT_SIMPLE_DATETIME = re.compile(
+        r'\s*(?:(?P<rel>next|this)\s+)?(?P<day>[a-z]+)(?:\s+at)?\s+(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?'
+        r'\s*(?P<am_pm>am|pm)?(?:\s+(?P<tz>[a-z]{2,4}))?\s*[.!?]?\s*'
+    )
+    
     def __init__(self, default_timezone: str = "America/New_York"):
-        self.default_tz = pytz.timezone(default_timezone)
+        self.default_tz = _tz(default_timezone)
         self.business_start = time(9, 0)  # 9 AM
         self.business_end = time(18, 0)   # 6 PM
-        
-        # Common timezone mappings
-        self.timezone_map = {
-            'est': 'America/New_York',
-            'eastern': 'America/New_York',
-            'et': 'America/New_York',
-            'pst': 'America/Los_Angeles', 
-            'pacific': 'America/Los_Angeles',
-            'pt': 'America/Los_Angeles',
-            'cst': 'America/Chicago',
-            'central': 'America/Chicago',
-            'ct': 'America/Chicago',
-            'mst': 'America/Denver',
-            'mountain': 'America/Denver',
-            'mt': 'America/Denver',
-            'utc': 'UTC',
-            'gmt': 'GMT'
-        }
-        
-        # Timezone info mapping for dateutil parser to eliminate warnings
-        self.tzinfos = {
-            'EST': pytz.timezone('America/New_York'),
-            'PST': pytz.timezone('America/Los_Angeles'),
-            'CST': pytz.timezone('America/Chicago'),
-            'MST': pytz.timezone('America/Denver'),
-            'EDT': pytz.timezone('America/New_York'),  # Daylight time
-            'PDT': pytz.timezone('America/Los_Angeles'),
-            'CDT': pytz.timezone('America/Chicago'),
-            'MDT': pytz.timezone('America/Denver')
-        }
-        
-        # Day of week mappings
-        self.day_names = {
-            'monday': 0, 'mon': 0,
-            'tuesday': 1, 'tue': 1, 'tues': 1,
-            'wednesday': 2, 'wed': 2,
-            'thursday': 3, 'thu': 3, 'thur': 3, 'thurs': 3,
-            'friday': 4, 'fri': 4,
-            'saturday': 5, 'sat': 5,
-            'sunday': 6, 'sun': 6
-        }
-        
-        # Time of day mappings
-        self.time_periods = {
-            'morning': (9, 12),
-            'afternoon': (13, 17),
-            'evening': (17, 20),
-            'night': (20, 23)
-        }
+        # Per-instance memo; a class-level lru_cache would keep every parser alive
+        self._parse_cached = lru_cache(maxsize=1024)(self._parse_frozen)
     
     def parse_time_expression(self, text: str) -> Dict[str, Union[datetime, List[datetime], str, None]]:
         """
@@ -89,200 +272,182 @@ class TimeParser:
                 'flexibility': 'strict'|'flexible'|'very_flexible'
             }
         """
+        # The cache holds immutable (key, value) pairs; each caller gets its own dict
+        return dict(self._parse_cached(text, int(_time.time() // 60)))
+    
+    def _parse_frozen(self, text: str, minute_bucket: int) -> Tuple[Tuple[str, Any], ...]:
+        """
+        Parse text into immutable (key, value) pairs for the per-minute cache.
+        
+        minute_bucket is part of the cache key so relative phrases like
+        "tomorrow" roll over naturally as time moves on. date_range is a
+        tuple of dates, so no cached value can be mutated in place.
+        """
+        return tuple(self._parse(text).items())
+    
+    def _parse(self, text: str) -> Dict[str, Union[datetime, List[datetime], str, None]]:
+        """Parse text against a single reading of the clock."""
         text_lower = text.lower()
+        # Read the clock once; every helper below works from this instant
+        _now = datetime.now(self.default_tz)
         
-        result = {
-            'preferred_datetime': None,
-            'date_range': None,
-            'time_preference': None,
-            'timezone': None,
-            'urgency': 'medium',
-            'flexibility': 'flexible'
-        }
+        result = _DEFAULT_RESULT.copy()
         
         try:
-            # Extract timezone
-            result['timezone'] = self._extract_timezone(text_lower)
-            
-            # Extract urgency
-            result['urgency'] = self._extract_urgency(text_lower)
-            
-            # Extract flexibility
-            result['flexibility'] = self._extract_flexibility(text_lower)
-            
-            # Extract time preference (morning/afternoon/evening)
-            result['time_preference'] = self._extract_time_preference(text_lower)
+            # One pass over the text classifies every keyword category
+            keywords = self._scan_keywords(text_lower)
+            result['timezone'] = keywords.get('timezone') or keywords.get('location')
+            result['urgency'] = keywords.get('urgency', 'medium')
+            result['flexibility'] = keywords.get('flexibility', 'flexible')
+            result['time_preference'] = keywords.get('time_period')
             
             # Try to parse specific datetime
-            specific_datetime = self._parse_specific_datetime(text, result['timezone'])
+            specific_datetime = self._parse_specific_datetime(text, text_lower, result['timezone'], _now)
             if specific_datetime:
                 result['preferred_datetime'] = specific_datetime
                 return result
             
-            # Parse relative time expressions
-            date_range = self._parse_relative_time(text_lower)
-            if date_range:
-                result['date_range'] = date_range
+            # Parse relative time expressions, only when a relative keyword was seen
+            if 'relative' in keywords:
+                date_range = self._parse_relative_time(text_lower, _now)
+                if date_range:
+                    result['date_range'] = date_range
             
-            logger.info(f"Parsed time expression: '{text}' -> {result}")
+            # Lazy %-formatting: the result dict is only rendered when INFO is enabled
+            logger.info("Parsed time expression: '%s' -> %s", text, result)
             return result
             
         except Exception as e:
             logger.error(f"Error parsing time expression '{text}': {e}")
             # Return default result for current week
-            now = datetime.now(self.default_tz)
-            end_of_week = now + timedelta(days=(6 - now.weekday()))
-            result['date_range'] = (now.date(), end_of_week.date())
+            end_of_week = _now + timedelta(days=(6 - _now.weekday()))
+            result['date_range'] = (_now.date(), end_of_week.date())
             return result
     
-    def _extract_timezone(self, text: str) -> Optional[str]:
-        """Extract timezone from text."""
-        # First check for explicit timezone mentions with word boundaries
-        for tz_abbr, tz_full in self.timezone_map.items():
-            # Use word boundaries to avoid partial matches
-            import re
-            pattern = r'\b' + re.escape(tz_abbr) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                return tz_full
-        
-        # Check for location-based timezone hints
-        location_timezone_map = {
-            'california': 'America/Los_Angeles',
-            'west coast': 'America/Los_Angeles',
-            'los angeles': 'America/Los_Angeles',
-            'san francisco': 'America/Los_Angeles',
-            'seattle': 'America/Los_Angeles',
-            'portland': 'America/Los_Angeles',
-            'vegas': 'America/Los_Angeles',
-            
-            'london': 'GMT',
-            'uk': 'GMT',
-            'britain': 'GMT',
-            'england': 'GMT',
-            'scotland': 'GMT',
-            'ireland': 'GMT',
-            
-            'chicago': 'America/Chicago',
-            'texas': 'America/Chicago',
-            'dallas': 'America/Chicago',
-            'houston': 'America/Chicago',
-            'milwaukee': 'America/Chicago',
-            'minneapolis': 'America/Chicago',
-            
-            'denver': 'America/Denver',
-            'colorado': 'America/Denver',
-            'utah': 'America/Denver',
-            'arizona': 'America/Denver',
-            'phoenix': 'America/Denver',
-            
-            'new york': 'America/New_York',
-            'nyc': 'America/New_York',
-            'boston': 'America/New_York',
-            'washington': 'America/New_York',
-            'atlanta': 'America/New_York',
-            'miami': 'America/New_York',
-            'philadelphia': 'America/New_York',
-            'toronto': 'America/New_York',
-            'montreal': 'America/New_York'
-        }
-        
-        for location, timezone in location_timezone_map.items():
-            if location in text.lower():
-                return timezone
+    def _scan_keywords(self, text: str) -> Dict[str, Union[str, bool]]:
+        """
+        Walk lowercased text once and return the winning value per keyword category.
         
-        return None
-    
-    def _extract_urgency(self, text: str) -> str:
-        """Extract urgency level from text."""
-        if any(word in text for word in ['urgent', 'asap', 'immediately', 'emergency', 'critical']):
-            return 'high'
-        elif any(word in text for word in ['soon', 'quickly', 'today', 'tomorrow']):
-            return 'medium'
-        elif any(word in text for word in ['later', 'whenever', 'no rush', 'flexible']):
-            return 'low'
-        return 'medium'
-    
-    def _extract_flexibility(self, text: str) -> str:
-        """Extract flexibility level from text."""
-        if any(word in text for word in ['exactly', 'specifically', 'must be', 'only']):
-            return 'strict'
-        elif any(word in text for word in ['around', 'roughly', 'approximately', 'about']):
-            return 'flexible'
-        elif any(word in text for word in ['anytime', 'whenever', 'flexible', 'open']):
-            return 'very_flexible'
-        return 'flexible'
-    
-    def _extract_time_preference(self, text: str) -> Optional[str]:
-        """Extract time of day preference."""
-        for period in self.time_periods:
-            if period in text:
-                return period
-        return None
+        Urgency and flexibility keep their level precedence; for the other
+        categories the first keyword mentioned wins.
+        """
+        best = {}
+        for match in _RE_KEYWORDS.finditer(text):
+            for category, value, priority in _KEYWORD_PAYLOADS[match.lastgroup]:
+                current = best.get(category)
+                if current is None or priority < current[1]:
+                    best[category] = (value, priority)
+        
+        return {category: value for category, (value, _) in best.items()}
     
-    def _parse_specific_datetime(self, text: str, timezone_str: Optional[str]) -> Optional[datetime]:
-        """Parse specific datetime expressions like 'tomorrow at 2pm', 'Friday at 10am'."""
+    def _parse_specific_datetime(self, text: str, text_lower: str, timezone_str: Optional[str],
+                                 _now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Parse specific datetime expressions like 'tomorrow at 2pm', 'Friday at 10am'.
+        
+        The patterns run over text_lower; dateutil gets the original text so
+        uppercase zone names like 'PST' still resolve through _TZINFOS.
+        """
         
         # Get target timezone
         target_tz = self.default_tz
         if timezone_str:
             try:
-                target_tz = pytz.timezone(timezone_str)
-            except:
+                target_tz = _tz(timezone_str)
+            except pytz.UnknownTimeZoneError:
                 pass
+        now = _now.astimezone(target_tz) if _now is not None else datetime.now(target_tz)
         
-        # First check for patterns that need manual parsing (next/this + day)
-        if re.search(r'\b(next|this)\s+\w*day', text.lower()):
-            # Skip dateutil for "next/this + day" patterns - handle manually
-            pass
-        else:
+        # Short "day [at] time [tz]" messages are built directly; dateutil only sees the long tail
+        simple_match = self._PAT_SIMPLE_DATETIME.fullmatch(text_lower)
+        if simple_match:
+            simple_dt = self._parse_simple_datetime(simple_match, target_tz, now)
+            if simple_dt:
+                return simple_dt
+        
+        # Skip dateutil for "next/this + day" patterns - handle manually
+        if not self._PAT_NEXT_THIS_DAY.search(text_lower):
             try:
                 # Try dateutil parser for other patterns with timezone info
-                parsed_dt = dateutil_parser.parse(text, fuzzy=True, tzinfos=self.tzinfos)
-                
+                parsed_dt = dateutil_parser.parse(text, fuzzy=True, tzinfos=_TZINFOS)
+            except (ValueError, OverflowError):
+                # dateutil's ParserError is a ValueError; OverflowError covers absurd numbers
+                parsed_dt = None
+            
+            if parsed_dt is not None:
                 # If no timezone info, assume target timezone
                 if parsed_dt.tzinfo is None:
                     parsed_dt = target_tz.localize(parsed_dt)
                 
                 # Only return if it's in the future
-                now = datetime.now(target_tz)
                 if parsed_dt > now:
                     return parsed_dt
-                    
-            except:
-                pass
         
-        # Try manual parsing for common patterns
-        patterns = [
-            # "next tuesday at 2pm", "this friday at 10am"  
-            (r'(next|this)\s+(\w+day)\s+at\s+(\d{1,2})\s*(am|pm)', self._parse_relative_day_time),
-            # "tomorrow at 2pm", "friday at 10am"
-            (r'(tomorrow|today|\w+day)\s+at\s+(\d{1,2})\s*(am|pm)', self._parse_day_time),
-            # "next friday", "this monday"
-            (r'(next|this)\s+(\w+day)', self._parse_relative_day),
-            # "2pm tomorrow", "10am friday"
-            (r'(\d{1,2})\s*(am|pm)\s+(tomorrow|today|\w+day)', self._parse_time_day),
-        ]
-        
-        for pattern, parser_func in patterns:
-            match = re.search(pattern, text.lower())
-            if match:
-                result = parser_func(match, target_tz)
-                if result:
-                    return result
+        # Try manual parsing for common patterns, all forms in one scan
+        for match in _RE_SPECIFIC.finditer(text_lower):
+            first, stop, handler = _SPECIFIC_DISPATCH[match.lastgroup]
+            result = getattr(self, handler)(match.group(*range(first, stop)), target_tz, now)
+            if result:
+                return result
         
         return None
     
-    def _parse_day_time(self, match, target_tz) -> Optional[datetime]:
-        """Parse 'tomorrow at 2pm' style expressions."""
-        day_expr, hour_str, am_pm = match.groups()
+    @staticmethod
+    def _to24(hour: int, am_pm: str) -> int:
+        """Convert a 12-hour clock reading to 24-hour; 12am is 0 and 12pm stays 12."""
+        return hour % 12 + (12 if am_pm[0] in 'pP' else 0)
+    
+    def _parse_simple_datetime(self, match, target_tz, _now: Optional[datetime] = None) -> Optional[datetime]:
+        """Build a datetime from a _PAT_SIMPLE_DATETIME match without dateutil."""
+        relative, day_expr = match.group('rel'), match.group('day')
+        hour, minute = int(match.group('hour')), int(match.group('minute') or 0)
+        
+        am_pm = match.group('am_pm')
+        if am_pm:
+            if hour > 12:
+                return None
+            hour = self._to24(hour, am_pm)
+        if hour > 23 or minute > 59:
+            return None
         
-        hour = int(hour_str)
-        if am_pm.lower() == 'pm' and hour != 12:
-            hour += 12
-        elif am_pm.lower() == 'am' and hour == 12:
-            hour = 0
+        # The timezone itself was already resolved by the keyword scan; only validate the token
+        if match.group('tz') and match.group('tz') not in _TIMEZONE_MAP:
+            return None
+        
+        now = _now if _now is not None else datetime.now(target_tz)
+        if day_expr in ('today', 'tomorrow'):
+            if relative:
+                return None
+            days_ahead = 0 if day_expr == 'today' else 1
+        elif day_expr in _DAY_NAMES:
+            # A bare or 'this' weekday keeps the same day; a past time rolls forward below
+            table = _DAYS_UNTIL_NEXT_WEEK if relative == 'next' else _DAYS_UNTIL
+            days_ahead = table[now.weekday()][_DAY_NAMES[day_expr]]
+        else:
+            return None
+        
+        target_date = (now + timedelta(days=days_ahead)).date()
+        target = target_tz.localize(
+            datetime(target_date.year, target_date.month, target_date.day, hour, minute)
+        )
+        if relative != 'next' and day_expr in _DAY_NAMES and target <= now:
+            # "friday at 10am" on a Friday afternoon means next week
+            target = target_tz.localize(datetime.combine(target_date + timedelta(days=7), target.time()))
         
-        base_date = datetime.now(target_tz).replace(hour=hour, minute=0, second=0, microsecond=0)
+        return target if target > now else None
+    
+    def _parse_day_time(self, groups: Tuple[str, ...], target_tz, _now: Optional[datetime] = None) -> Optional[datetime]:
+        """Parse 'tomorrow at 2pm' style expressions."""
+        day_expr, hour_str, am_pm = groups
+        return self._parse_day_time_impl(day_expr, hour_str, am_pm, target_tz, _now)
+    
+    def _parse_day_time_impl(self, day_expr: str, hour_str: str, am_pm: str, target_tz,
+                             _now: Optional[datetime] = None) -> Optional[datetime]:
+        """Resolve a day expression plus a 12-hour time; shared by both word orders."""
+        hour = self._to24(int(hour_str), am_pm)
+        
+        now = _now if _now is not None else datetime.now(target_tz)
+        base_date = now.replace(hour=hour, minute=0, second=0, microsecond=0)
         
         if day_expr == 'today':
             target_date = base_date
@@ -291,35 +456,33 @@ class TimeParser:
         else:
             # Parse day name
             day_name = day_expr.replace('day', '').strip()
-            if day_name in self.day_names:
-                target_weekday = self.day_names[day_name]
-                days_ahead = (target_weekday - base_date.weekday()) % 7
-                if days_ahead == 0:  # Same day, move to next week
-                    days_ahead = 7
+            if day_name in _DAY_NAMES:
+                # Same day moves to next week
+                days_ahead = _DAYS_UNTIL_NEXT[base_date.weekday()][_DAY_NAMES[day_name]]
                 target_date = base_date + timedelta(days=days_ahead)
             else:
                 return None
         
         # Only return if it's in the future
-        if target_date > datetime.now(target_tz):
+        if target_date > now:
             return target_date
         
         return None
     
-    def _parse_relative_day(self, match, target_tz) -> Optional[datetime]:
+    def _parse_relative_day(self, groups: Tuple[str, ...], target_tz, _now: Optional[datetime] = None) -> Optional[datetime]:
         """Parse 'next friday', 'this monday' expressions."""
-        relative, day_name = match.groups()
+        relative, day_name = groups
         
         day_name_clean = day_name.replace('day', '').strip()
-        if day_name_clean not in self.day_names:
+        if day_name_clean not in _DAY_NAMES:
             return None
         
-        target_weekday = self.day_names[day_name_clean]
-        now = datetime.now(target_tz)
+        target_weekday = _DAY_NAMES[day_name_clean]
+        now = _now if _now is not None else datetime.now(target_tz)
         
         if relative == 'this':
             # This week
-            days_ahead = (target_weekday - now.weekday()) % 7
+            days_ahead = _DAYS_UNTIL[now.weekday()][target_weekday]
             if days_ahead == 0:  # Today, set to business hours
                 target_date = now.replace(hour=10, minute=0, second=0, microsecond=0)
                 if target_date <= now:  # Already passed, move to next week
@@ -329,30 +492,26 @@ class TimeParser:
                 target_date = target_date.replace(hour=10, minute=0, second=0, microsecond=0)
         else:  # next
             # Next week - always go to the following week
-            days_ahead = (target_weekday - now.weekday()) % 7
-            if days_ahead == 0:  # Same day next week
-                days_ahead = 7
-            else:
-                days_ahead += 7  # Always add 7 days for "next" week
+            days_ahead = _DAYS_UNTIL_NEXT_WEEK[now.weekday()][target_weekday]
             target_date = now + timedelta(days=days_ahead)
             target_date = target_date.replace(hour=10, minute=0, second=0, microsecond=0)
         
         return target_date
     
-    def _parse_relative_day_time(self, match, target_tz) -> Optional[datetime]:
+    def _parse_relative_day_time(self, groups: Tuple[str, ...], target_tz, _now: Optional[datetime] = None) -> Optional[datetime]:
         """Parse 'next tuesday at 2pm', 'this friday at 10am' expressions."""
-        relative, day_name, hour_str, am_pm = match.groups()
+        relative, day_name, hour_str, am_pm = groups
         
         day_name_clean = day_name.replace('day', '').strip()
-        if day_name_clean not in self.day_names:
+        if day_name_clean not in _DAY_NAMES:
             return None
         
-        target_weekday = self.day_names[day_name_clean]
-        now = datetime.now(target_tz)
+        target_weekday = _DAY_NAMES[day_name_clean]
+        now = _now if _now is not None else datetime.now(target_tz)
         
         # Calculate the target date (same logic as _parse_relative_day)
         if relative == 'this':
-            days_ahead = (target_weekday - now.weekday()) % 7
+            days_ahead = _DAYS_UNTIL[now.weekday()][target_weekday]
             if days_ahead == 0:  # Today
                 target_date = now.replace(hour=10, minute=0, second=0, microsecond=0)
                 if target_date <= now:  # Already passed, move to next week
@@ -360,61 +519,32 @@ class TimeParser:
             else:
                 target_date = now + timedelta(days=days_ahead)
         else:  # next
-            days_ahead = (target_weekday - now.weekday()) % 7
-            if days_ahead == 0:  # Same day next week
-                days_ahead = 7
-            else:
-                days_ahead += 7  # Always add 7 days for "next" week
+            days_ahead = _DAYS_UNTIL_NEXT_WEEK[now.weekday()][target_weekday]
             target_date = now + timedelta(days=days_ahead)
         
         # Apply the specific time
-        hour = int(hour_str)
-        if am_pm.lower() == 'pm' and hour != 12:
-            hour += 12
-        elif am_pm.lower() == 'am' and hour == 12:
-            hour = 0
-            
+        hour = self._to24(int(hour_str), am_pm)
         target_date = target_date.replace(hour=hour, minute=0, second=0, microsecond=0)
         return target_date
     
-    def _parse_time_day(self, match, target_tz) -> Optional[datetime]:
+    def _parse_time_day(self, groups: Tuple[str, ...], target_tz, _now: Optional[datetime] = None) -> Optional[datetime]:
         """Parse '2pm tomorrow' style expressions."""
-        hour_str, am_pm, day_expr = match.groups()
-        
-        hour = int(hour_str)
-        if am_pm.lower() == 'pm' and hour != 12:
-            hour += 12
-        elif am_pm.lower() == 'am' and hour == 12:
-            hour = 0
-        
-        # Use the day_time parser logic
-        day_time_match = type('Match', (), {
-            'groups': lambda: (day_expr, hour_str, am_pm)
-        })()
-        
-        return self._parse_day_time(day_time_match, target_tz)
+        hour_str, am_pm, day_expr = groups
+        return self._parse_day_time_impl(day_expr, hour_str, am_pm, target_tz, _now)
     
-    def _parse_relative_time(self, text: str) -> Optional[Tuple[datetime, datetime]]:
+    def _parse_relative_time(self, text: str, _now: Optional[datetime] = None) -> Optional[Tuple[datetime, datetime]]:
         """Parse relative time expressions like 'next week', 'this month'."""
-        now = datetime.now(self.default_tz)
+        now = _now if _now is not None else datetime.now(self.default_tz)
         
         if 'next week' in text:
             # Next week (Monday to Friday) - always go to the following week
-            current_weekday = now.weekday()  # Monday=0, Sunday=6
-            days_until_next_monday = 7 - current_weekday  # Always next week's Monday
-            if current_weekday == 0:  # If today is Monday
-                days_until_next_monday = 7  # Go to next Monday
-            next_monday = now + timedelta(days=days_until_next_monday)
+            next_monday = now + timedelta(days=_DAYS_UNTIL_NEXT[now.weekday()][0])
             next_friday = next_monday + timedelta(days=4)
             return (next_monday.date(), next_friday.date())
         
         elif 'this week' in text:
             # This week (today to Friday)
-            days_until_friday = (4 - now.weekday()) % 7
-            if days_until_friday == 0 and now.weekday() == 4:  # Today is Friday
-                end_date = now.date()
-            else:
-                end_date = (now + timedelta(days=days_until_friday)).date()
+            end_date = (now + timedelta(days=_DAYS_UNTIL[now.weekday()][4])).date()
             return (now.date(), end_date)
         
         elif 'tomorrow' in text:
@@ -425,34 +555,29 @@ class TimeParser:
             return (now.date(), now.date())
         
         elif 'next month' in text:
-            next_month_start = (now + relativedelta(months=1)).replace(day=1)
-            next_month_end = (next_month_start + relativedelta(months=1)) - timedelta(days=1)
-            return (next_month_start.date(), next_month_end.date())
+            return self._next_month_bounds(now)
         
         # Try to find specific day names for this/next week
-        for day_name, day_num in self.day_names.items():
+        for day_name, day_num in _DAY_NAMES.items():
             if day_name in text:
-                # Calculate days ahead to the target day
-                days_ahead = (day_num - now.weekday()) % 7
-                
-                if 'next' in text and day_name in text:
+                if 'next' in text:
                     # "next friday" - always go to next week's occurrence
-                    if days_ahead == 0:  # Same day of week
-                        days_ahead = 7  # Next week
-                    else:
-                        days_ahead += 7  # Add a week to get next week's occurrence
-                    target_date = (now + timedelta(days=days_ahead)).date()
+                    days_ahead = _DAYS_UNTIL_NEXT_WEEK[now.weekday()][day_num]
                 else:
-                    # Just "friday" - next occurrence this week or next
-                    if days_ahead == 0:  # Today is that day
-                        target_date = now.date()
-                    else:
-                        target_date = (now + timedelta(days=days_ahead)).date()
+                    # Just "friday" - next occurrence, today included
+                    days_ahead = _DAYS_UNTIL[now.weekday()][day_num]
+                target_date = (now + timedelta(days=days_ahead)).date()
                 
                 return (target_date, target_date)
         
         return None
     
+    @staticmethod
+    def _next_month_bounds(now: datetime) -> Tuple[date, date]:
+        """First and last day of the month after now, using plain integer math."""
+        year, month = (now.year + 1, 1) if now.month == 12 else (now.year, now.month + 1)
+        return (date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1]))
+    
     def suggest_time_slots(self, parsed_time: Dict, available_slots: List) -> List:
         """
         Filter and rank available slots based on parsed time preferences.
@@ -467,6 +592,21 @@ class TimeParser:
         if not available_slots:
             return []
         
+        # Everything that does not depend on the slot is resolved once up front
+        date_range = parsed_time.get('date_range')
+        if date_range:
+            # Day ordinals turn the per-slot range check into plain int comparisons
+            start_ord, end_ord = date_range[0].toordinal(), date_range[1].toordinal()
+        preferred = parsed_time.get('preferred_datetime')
+        pref_hours = _TIME_PERIODS.get(parsed_time.get('time_preference'))
+        if pref_hours:
+            start_hour, end_hour = pref_hours
+        urgent = parsed_time.get('urgency') == 'high'
+        if urgent:
+            # One clock read for the whole batch; naive slots compare against local wall time
+            now_aware = datetime.now(pytz.utc)
+            now_naive = now_aware.astimezone().replace(tzinfo=None)
+        
         matching_slots = []
         
         for slot in available_slots:
@@ -474,18 +614,14 @@ class TimeParser:
             score = 0
             
             # Check date range match
-            if parsed_time.get('date_range'):
-                start_date, end_date = parsed_time['date_range']
-                slot_date = slot_datetime.date()
-                
-                if start_date <= slot_date <= end_date:
+            if date_range:
+                if start_ord <= slot_datetime.toordinal() <= end_ord:
                     score += 10
                 else:
                     continue  # Skip slots outside date range
             
             # Check specific datetime preference
-            if parsed_time.get('preferred_datetime'):
-                preferred = parsed_time['preferred_datetime']
+            if preferred:
                 time_diff = abs((slot_datetime - preferred).total_seconds() / 3600)  # Hours
                 
                 if time_diff < 1:  # Within 1 hour
@@ -498,19 +634,14 @@ class TimeParser:
                     score += 5
             
             # Check time of day preference
-            if parsed_time.get('time_preference'):
-                slot_hour = slot_datetime.hour
-                pref = parsed_time['time_preference']
-                
-                if pref in self.time_periods:
-                    start_hour, end_hour = self.time_periods[pref]
-                    if start_hour <= slot_hour <= end_hour:
-                        score += 15
+            if pref_hours and start_hour <= slot_datetime.hour <= end_hour:
+                score += 15
             
             # Urgency bonus
-            if parsed_time.get('urgency') == 'high':
+            if urgent:
                 # Prefer earlier slots
-                hours_from_now = (slot_datetime - datetime.now(slot_datetime.tzinfo)).total_seconds() / 3600
+                now = now_aware if slot_datetime.tzinfo else now_naive
+                hours_from_now = (slot_datetime - now).total_seconds() / 3600
                 if hours_from_now < 24:  # Within 24 hours
                     score += 10
                 elif hours_from_now < 48:  # Within 48 hours
@@ -538,30 +669,22 @@ class TimeParser:
             target_timezone = self.default_tz.zone
         
         try:
-            target_tz = pytz.timezone(target_timezone)
+            target_tz = _tz(target_timezone)
             converted_dt = dt.astimezone(target_tz)
             
-            # Format with timezone abbreviation
-            tz_name = converted_dt.strftime('%Z')
-            if tz_name == 'EST' or tz_name == 'EDT':
-                tz_display = 'EST'
-            elif tz_name == 'PST' or tz_name == 'PDT':
-                tz_display = 'PST'
-            elif tz_name == 'CST' or tz_name == 'CDT':
-                tz_display = 'CST'
-            elif tz_name == 'MST' or tz_name == 'MDT':
-                tz_display = 'MST'
-            elif tz_name == 'UTC' or tz_name == 'GMT':
-                tz_display = 'UTC'
-            else:
-                tz_display = tz_name
+            # Format with timezone abbreviation; a zone's offset pins down which one applies
+            abbr_key = (target_timezone, converted_dt.utcoffset())
+            tz_display = _TZ_ABBREVIATIONS.get(abbr_key)
+            if tz_display is None:
+                tz_name = converted_dt.strftime('%Z')
+                tz_display = _TZ_ABBREVIATIONS[abbr_key] = _TZ_DISPLAY.get(tz_name, tz_name)
             
-            return f"{converted_dt.strftime('%A, %B %d at %I:%M %p')} {tz_display}"
+            return f"{_format_datetime(converted_dt)} {tz_display}"
             
         except Exception as e:
             logger.warning(f"Error formatting time in timezone {target_timezone}: {e}")
             # Fallback to default timezone
-            return f"{dt.strftime('%A, %B %d at %I:%M %p')} EST"
+            return f"{_format_datetime(dt)} EST"
     
     def format_dual_timezone(self, dt: datetime, user_timezone: str = None) -> str:
         """
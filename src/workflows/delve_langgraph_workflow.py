@@ -3,18 +3,40 @@ Delve LangGraph Workflow - The new main workflow system.
 Replaces the problematic multi-agent routing system with a clean LangGraph implementation.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Awaitable, Callable, Optional, Sequence, Tuple
 from datetime import datetime
 
-from src.models.schemas import SupportMessage, AgentState
+from src.models.schemas import SupportMessage, AgentState, AgentResponse
 from src.integrations.slack_client import slack_client
+from src.integrations.slack_queue import slack_send_queue
 from src.workflows.langgraph_workflow import langgraph_workflow
 from src.core.session_manager import SessionManager
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Assignment state rarely flips within seconds, so lookups are reused briefly per user
+AI_DISABLED_CACHE_TTL = 5.0
+AI_DISABLED_CACHE_MAX_SIZE = 4096
+
+# Liveness probes can poll often; reuse a healthy result briefly, retry failures sooner
+HEALTH_CACHE_TTL = 5.0
+HEALTH_FAILURE_CACHE_TTL = 1.0
+
+# Reply used while a human agent owns the conversation; copied per message instead of re-validated
+_HUMAN_ASSIGNED_TEMPLATE = AgentResponse(
+    agent_name="human_agent_handler",
+    response_text="Your request is currently being handled by one of our support specialists. They will respond shortly.",
+    confidence_score=1.0,
+    sources=[],
+    should_escalate=False,
+    escalation_reason="Human agent already assigned",
+    metadata={'ai_disabled': True, 'human_assigned': True}
+)
+
 
 class DelveLangGraphWorkflow:
     """
@@ -28,135 +50,156 @@ class DelveLangGraphWorkflow:
         self.workflow_name = "delve_langgraph_workflow"
         self.system_initialized = False
         self.responder_agent = responder_agent  # New bidirectional responder system
+        # user_id -> (expires_at, assigned session row or None)
+        self._ai_disabled_cache: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        # (expires_at, healthy) from the last LangGraph health check
+        self._health_cache: Tuple[float, bool] = (0.0, False)
         
-        # Initialize session manager for direct escalation handling
-        self.session_manager = None
-        if settings.supabase_url and settings.supabase_key:
-            try:
-                self.session_manager = SessionManager(
-                    supabase_url=settings.supabase_url,
-                    supabase_key=settings.supabase_key
-                )
-                logger.info("Session manager initialized for escalation handling")
-            except Exception as e:
-                logger.error(f"Failed to initialize session manager: {e}")
+        # Session manager for direct escalation handling, created on first use
+        self._session_manager: Optional[SessionManager] = None
+        self._session_manager_loaded = False
         
         logger.info("Delve LangGraph Workflow initialized")
     
+    @property
+    def session_manager(self) -> Optional[SessionManager]:
+        """Get or create the SessionManager; None when Supabase is not configured."""
+        if not self._session_manager_loaded:
+            self._session_manager_loaded = True
+            if settings.supabase_url and settings.supabase_key:
+                try:
+                    self._session_manager = SessionManager(
+                        supabase_url=settings.supabase_url,
+                        supabase_key=settings.supabase_key
+                    )
+                    logger.info("Session manager initialized for escalation handling")
+                except Exception as e:
+                    logger.error("Failed to initialize session manager: %s", e)
+        return self._session_manager
+    
     async def process_message(self, message: SupportMessage) -> AgentState:
         """
         Process support message through the LangGraph workflow.
         
         This is the main entry point that replaces the old workflow logic.
         """
+        # Monotonic clock for elapsed time; wall-clock datetimes are only kept where they are stored
+        started = time.monotonic()
+        logger.info("Processing message %s through Delve LangGraph workflow", message.message_id)
+        
+        # Step 0: Check if AI is disabled due to human agent assignment (Chainlit only)
+        if message.channel_id.startswith('chainlit_') and await self._is_ai_disabled_for_message(message):
+            logger.info("AI disabled for message %s - human agent assigned", message.message_id)
+            return self._create_human_assigned_state(message)
+        
+        # Step 1: Queue acknowledgment; enqueueing returns at once and the
+        # per-channel queue keeps it ahead of the answer
         try:
-            logger.info(f"Processing message {message.message_id} through Delve LangGraph workflow")
-            
-            # Step 0: Check if AI is disabled due to human agent assignment
-            if await self._is_ai_disabled_for_message(message):
-                logger.info(f"AI disabled for message {message.message_id} - human agent assigned")
-                return self._create_human_assigned_state(message)
-            
-            # Step 1: Send immediate acknowledgment
-            try:
-                await slack_client.send_acknowledgment(message)
-                logger.info(f"Acknowledgment sent for message {message.message_id}")
-            except Exception as e:
-                logger.warning(f"Could not send acknowledgment: {e}")
-            
-            # Step 2: Process through LangGraph workflow
-            workflow_state = await langgraph_workflow.process_message(message)
-            
-            # Step 3: Convert LangGraph state to legacy AgentState for compatibility
-            agent_state = self._convert_to_agent_state(workflow_state)
-            
-            # Step 4: Send response to Slack
-            final_response = workflow_state.get('final_response') if isinstance(workflow_state, dict) else getattr(workflow_state, 'final_response', None)
-            
-            if final_response:
-                try:
-                    await slack_client.send_response(
-                        message,
-                        final_response.response_text,
-                        final_response.sources
-                    )
-                    logger.info(f"Response sent for message {message.message_id}")
-                    
-                    # Handle escalation through responder system if needed
-                    if final_response.should_escalate:
-                        if self.responder_agent:
-                            # Use new bidirectional responder system
-                            await self._handle_escalation_through_responder(
-                                message, final_response
-                            )
-                        else:
-                            # Fallback: Create session directly when no responder agent
-                            await self._handle_escalation_direct(message, final_response)
-                        logger.info(f"Escalation handled for message {message.message_id}")
-                        
-                except Exception as e:
-                    logger.warning(f"Could not send response: {e}")
-            
-            # Log final metrics
-            processing_completed = workflow_state.get('processing_completed') if isinstance(workflow_state, dict) else getattr(workflow_state, 'processing_completed', None)
-            processing_started = workflow_state.get('processing_started') if isinstance(workflow_state, dict) else getattr(workflow_state, 'processing_started', None)
-            intent = workflow_state.get('intent') if isinstance(workflow_state, dict) else getattr(workflow_state, 'intent', None)
-            intent_confidence = workflow_state.get('intent_confidence') if isinstance(workflow_state, dict) else getattr(workflow_state, 'intent_confidence', 0.0)
-            
-            if processing_completed and processing_started:
-                processing_time = (processing_completed - processing_started).total_seconds()
-                
-                logger.info(
-                    f"Message {message.message_id} processed in {processing_time:.2f}s. "
-                    f"Intent: {intent}, "
-                    f"Confidence: {intent_confidence:.2f}, "
-                    f"Final agent: {final_response.agent_name if final_response else 'none'}, "
-                    f"Escalated: {final_response.should_escalate if final_response else False}"
-                )
-            
-            return agent_state
-            
+            await slack_send_queue.enqueue(message.channel_id, slack_client.send_acknowledgment, message)
+            logger.info("Acknowledgment queued for message %s", message.message_id)
         except Exception as e:
-            logger.error(f"Error in Delve LangGraph workflow: {e}")
-            
-            # Create error state
-            error_state = AgentState(
-                message=message,
-                agent_responses=[],
-                escalated=True,
-                final_response="I'm experiencing technical difficulties. Let me connect you with our support team immediately.",
-                processing_completed=datetime.now()
-            )
-            
-            # Try to notify about the error
+            logger.warning("Could not queue acknowledgment: %s", e)
+        
+        # Step 2: Stream the LangGraph workflow, sending the response as soon as
+        # finalize produces it instead of waiting for the whole run to return.
+        # Earlier nodes (e.g. the approval gate) may set an interim final_response
+        # that finalize replaces, so only finalize's is sent.
+        workflow_state: Dict[str, Any] = {}
+        final_response = None
+        workflow_error: Optional[Exception] = None
+        
+        try:
+            async for node_name, update in langgraph_workflow.astream(message):
+                workflow_state.update(update)
+                if node_name == 'finalize' and update.get('final_response'):
+                    final_response = update['final_response']
+                    await self._queue_final_response(message, final_response, node_name)
+        except Exception as e:
+            workflow_error = e
+        
+        if workflow_error is not None:
+            if final_response is None:
+                # Nothing reached the user yet, so take the full error path
+                return await self._handle_workflow_error(message, workflow_error)
+            logger.warning("LangGraph workflow failed after responding to %s: %s", message.message_id, workflow_error)
+        
+        # Step 3: Convert LangGraph state to legacy AgentState for compatibility
+        workflow_state.setdefault('message', message)
+        agent_state = self._convert_to_agent_state(workflow_state)
+        
+        # Read the response fields once for escalation and the metrics log
+        agent_name, should_escalate = 'none', False
+        if final_response:
+            should_escalate = final_response.should_escalate
+            agent_name = getattr(final_response, 'agent_name', None)
+        
+        # Step 4: Handle escalation through responder system if needed
+        if should_escalate:
             try:
-                await slack_client.send_response(
-                    message,
-                    error_state.final_response
-                )
                 if self.responder_agent:
-                    # Use responder system for error escalation
-                    try:
-                        await self.responder_agent.escalate_conversation(
-                            support_message=message,
-                            escalation_reason=f"LangGraph workflow error: {str(e)}",
-                            conversation_history=[]
-                        )
-                    except:
-                        # Ultimate fallback
-                        await slack_client.send_escalation_notification(
-                            message,
-                            f"LangGraph workflow error: {str(e)}"
-                        )
-                else:
-                    await slack_client.send_escalation_notification(
-                        message,
-                        f"LangGraph workflow error: {str(e)}"
+                    # Use new bidirectional responder system
+                    await self._handle_escalation_through_responder(
+                        message, final_response
                     )
-            except Exception as fallback_error:
-                logger.error(f"Even fallback notification failed: {fallback_error}")
-            
-            return error_state
+                else:
+                    # Fallback: Create session directly when no responder agent
+                    await self._handle_escalation_direct(message, final_response)
+                logger.info("Escalation handled for message %s", message.message_id)
+            except Exception as e:
+                logger.warning("Could not handle escalation: %s", e)
+        
+        # Log final metrics
+        processing_time = time.monotonic() - started
+        intent = workflow_state.get('intent')
+        intent_confidence = workflow_state.get('intent_confidence') or 0.0
+        
+        logger.info(
+            "Message %s processed in %.2fs. Intent: %s, Confidence: %.2f, Final agent: %s, Escalated: %s",
+            message.message_id, processing_time, intent, intent_confidence, agent_name, should_escalate
+        )
+        
+        return agent_state
+    
+    async def _queue_final_response(self, message: SupportMessage, final_response, node_name: str) -> None:
+        """Queue the final response for Slack behind the acknowledgment."""
+        try:
+            await slack_send_queue.enqueue(
+                message.channel_id,
+                slack_client.send_response,
+                message,
+                final_response.response_text,
+                final_response.sources
+            )
+            logger.info("Response queued for message %s after %s", message.message_id, node_name)
+        except Exception as e:
+            logger.warning("Could not send response: %s", e)
+    
+    async def _handle_workflow_error(self, message: SupportMessage, error: Exception) -> AgentState:
+        """Tell the user something went wrong, escalate, and return an error AgentState."""
+        logger.error("Error in Delve LangGraph workflow: %s", error)
+        
+        # Create error state
+        error_state = AgentState(
+            message=message,
+            agent_responses=[],
+            escalated=True,
+            final_response="I'm experiencing technical difficulties. Let me connect you with our support team immediately.",
+            processing_completed=datetime.now()
+        )
+        
+        # Try to notify about the error
+        try:
+            await slack_send_queue.enqueue(
+                message.channel_id,
+                slack_client.send_response,
+                message,
+                error_state.final_response
+            )
+            await self._safe_escalate(message, f"LangGraph workflow error: {str(error)}")
+        except Exception as fallback_error:
+            logger.error("Even fallback notification failed: %s", fallback_error)
+        
+        return error_state
     
     async def _handle_escalation_direct(
         self,
@@ -167,7 +210,9 @@ class DelveLangGraphWorkflow:
         try:
             if not self.session_manager:
                 logger.warning("No session manager available - escalation will only be logged")
-                await slack_client.send_escalation_notification(
+                await slack_send_queue.enqueue(
+                    message.channel_id,
+                    slack_client.send_escalation_notification,
                     message,
                     final_response.escalation_reason
                 )
@@ -193,18 +238,22 @@ class DelveLangGraphWorkflow:
                 history=conversation_history
             )
             
-            logger.info(f"Created escalation session directly: {session.session_id}")
+            logger.info("Created escalation session directly: %s", session.session_id)
             
             # Send escalation notification to Slack
-            await slack_client.send_escalation_notification(
+            await slack_send_queue.enqueue(
+                message.channel_id,
+                slack_client.send_escalation_notification,
                 message,
                 final_response.escalation_reason
             )
             
         except Exception as e:
-            logger.error(f"Error in direct escalation handling: {e}")
+            logger.error("Error in direct escalation handling: %s", e)
             # Final fallback - just send notification
-            await slack_client.send_escalation_notification(
+            await slack_send_queue.enqueue(
+                message.channel_id,
+                slack_client.send_escalation_notification,
                 message,
                 final_response.escalation_reason
             )
@@ -215,64 +264,82 @@ class DelveLangGraphWorkflow:
         final_response
     ) -> None:
         """Handle escalation through the new bidirectional responder system."""
-        try:
-            # Build conversation history from any available context
-            conversation_history = []
-            
-            # Extract conversation history if available (this could be enhanced)
-            if hasattr(final_response, 'metadata') and final_response.metadata:
-                conversation_history = final_response.metadata.get('conversation_history', [])
-            
-            # Add the current AI response to history
-            conversation_history.append({
-                'sender': 'AI Agent',
-                'content': final_response.response_text,
-                'timestamp': datetime.now().isoformat(),
-                'confidence_score': getattr(final_response, 'confidence_score', 0.0),
-                'agent_name': getattr(final_response, 'agent_name', 'unknown')
-            })
-            
-            # Escalate through responder system
-            escalation_response = await self.responder_agent.escalate_conversation(
-                support_message=message,
-                escalation_reason=final_response.escalation_reason,
-                conversation_history=conversation_history
-            )
-            
+        # Build conversation history from any available context
+        conversation_history = []
+        
+        # Extract conversation history if available (this could be enhanced)
+        if hasattr(final_response, 'metadata') and final_response.metadata:
+            conversation_history = final_response.metadata.get('conversation_history', [])
+        
+        # Add the current AI response to history
+        conversation_history.append({
+            'sender': 'AI Agent',
+            'content': final_response.response_text,
+            'timestamp': datetime.now().isoformat(),
+            'confidence_score': getattr(final_response, 'confidence_score', 0.0),
+            'agent_name': getattr(final_response, 'agent_name', 'unknown')
+        })
+        
+        # Fallback: Create session directly if responder system fails
+        escalation_response = await self._safe_escalate(
+            message,
+            final_response.escalation_reason,
+            conversation_history,
+            fallback=lambda: self._handle_escalation_direct(message, final_response)
+        )
+        
+        if escalation_response is not None:
             session_id = getattr(escalation_response, 'session_id', 'None')
-            logger.info(f"Escalated through responder system: session_id={session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error escalating through responder system: {e}")
-            # Fallback: Create session directly if responder system fails
-            await self._handle_escalation_direct(message, final_response)
+            logger.info("Escalated through responder system: session_id=%s", session_id)
+    
+    async def _safe_escalate(
+        self,
+        message: SupportMessage,
+        reason: str,
+        history: Sequence[Dict[str, Any]] = (),
+        fallback: Optional[Callable[[], Awaitable[None]]] = None
+    ) -> Optional[Any]:
+        """
+        Escalate through the responder system, falling back if it is missing or fails.
+        
+        The default fallback queues a plain escalation notification. Returns the
+        responder's escalation response, or None when the fallback ran.
+        """
+        if self.responder_agent:
+            try:
+                return await self.responder_agent.escalate_conversation(
+                    support_message=message,
+                    escalation_reason=reason,
+                    conversation_history=list(history)
+                )
+            except Exception as e:
+                logger.error("Error escalating through responder system: %s", e)
+        
+        if fallback is not None:
+            await fallback()
+        else:
+            await slack_send_queue.enqueue(
+                message.channel_id,
+                slack_client.send_escalation_notification,
+                message,
+                reason
+            )
+        return None
     
     def set_responder_agent(self, responder_agent):
         """Set the responder agent for handling escalations."""
         self.responder_agent = responder_agent
         logger.info("Responder agent configured for escalations")
     
-    def _convert_to_agent_state(self, workflow_result) -> AgentState:
-        """Convert LangGraph result to legacy AgentState for compatibility."""
-        agent_responses = []
-        
-        # Handle both dict and WorkflowState object returns
-        if isinstance(workflow_result, dict):
-            # LangGraph returns a dict, extract the data
-            subgraph_results = workflow_result.get('subgraph_results', {})
-            final_response = workflow_result.get('final_response')
-            message = workflow_result.get('message')
-            processing_completed = workflow_result.get('processing_completed')
-        else:
-            # WorkflowState object
-            subgraph_results = getattr(workflow_result, 'subgraph_results', {})
-            final_response = getattr(workflow_result, 'final_response', None)
-            message = getattr(workflow_result, 'message', None)
-            processing_completed = getattr(workflow_result, 'processing_completed', None)
+    def _convert_to_agent_state(self, workflow_state: Dict[str, Any]) -> AgentState:
+        """Convert a normalized LangGraph result to legacy AgentState for compatibility."""
+        subgraph_results = workflow_state.get('subgraph_results') or {}
+        final_response = workflow_state.get('final_response')
+        message = workflow_state.get('message')
+        processing_completed = workflow_state.get('processing_completed')
         
-        # Convert subgraph results to agent responses
-        for subgraph_name, result in subgraph_results.items():
-            agent_responses.append(result)
+        # Subgraph results become agent responses, in the order the subgraphs reported
+        agent_responses = list(subgraph_results.values())
         
         # Add final response if it exists
         if final_response:
@@ -288,14 +355,22 @@ class DelveLangGraphWorkflow:
     
     async def health_check(self) -> bool:
         """Check if the workflow is healthy."""
+        expires_at, cached_healthy = self._health_cache
+        if time.monotonic() < expires_at:
+            return cached_healthy
+        
         try:
             # Check LangGraph workflow health
             health_result = await langgraph_workflow.health_check()
-            return health_result.get("healthy", False)
+            healthy = health_result.get("healthy", False)
             
         except Exception as e:
-            logger.error(f"Delve LangGraph workflow health check failed: {e}")
-            return False
+            logger.error("Delve LangGraph workflow health check failed: %s", e)
+            healthy = False
+        
+        ttl = HEALTH_CACHE_TTL if healthy else HEALTH_FAILURE_CACHE_TTL
+        self._health_cache = (time.monotonic() + ttl, healthy)
+        return healthy
     
     def get_stats(self) -> Dict[str, Any]:
         """Get workflow statistics."""
@@ -307,53 +382,57 @@ class DelveLangGraphWorkflow:
         }
     
     async def _is_ai_disabled_for_message(self, message: SupportMessage) -> bool:
-        """Check if AI should be disabled for this message (human agent assigned)."""
+        """Check if AI should be disabled for this Chainlit message (human agent assigned)."""
         try:
-            # For Chainlit messages, check session by user info
-            if message.channel_id.startswith('chainlit_'):
-                from src.core.session_manager import SessionManager
-                from src.core.config import settings
-                
-                session_manager = SessionManager(
-                    supabase_url=settings.supabase_url,
-                    supabase_key=settings.supabase_key
-                )
-                
-                # Find only ASSIGNED sessions for this user (not closed ones)
-                assigned_sessions = await session_manager.get_sessions_by_state("assigned")
-                
-                # Check if this user has any actively assigned sessions
-                for session in assigned_sessions:
-                    if session.user_id == message.user_id and session.ai_disabled:
-                        logger.info(f"AI disabled for user {message.user_name} - active session {session.session_id} assigned to {session.assigned_agent_name}")
-                        return True
-                        
-                # Debug: Log all sessions for this user to understand the state
+            # Reuse the manager built in __init__ instead of a new client per message
+            session_manager = self.session_manager
+            if session_manager is None:
+                return False
+            
+            session = await self._get_assigned_session(session_manager, message.user_id)
+            if session:
+                logger.info("AI disabled for user %s - active session %s assigned to %s", message.user_name, session['session_id'], session.get('assigned_agent_name'))
+                return True
+            
+            # Debug: Log all sessions for this user to understand the state
+            if logger.isEnabledFor(logging.DEBUG):
                 all_user_sessions = await session_manager.get_sessions_by_user(message.user_id)
-                logger.info(f"DEBUG: User {message.user_name} has {len(all_user_sessions)} total sessions:")
+                logger.debug("User %s has %s total sessions:", message.user_name, len(all_user_sessions))
                 for session in all_user_sessions:
-                    logger.info(f"  - Session {session.session_id}: state={session.state.value}, ai_disabled={session.ai_disabled}, assigned_to={session.assigned_to}")
-                
+                    logger.debug("  - Session %s: state=%s, ai_disabled=%s, assigned_to=%s", session.session_id, session.state.value, session.ai_disabled, session.assigned_to)
+            
             return False
             
         except Exception as e:
-            logger.error(f"Error checking AI disabled status: {e}")
+            logger.error("Error checking AI disabled status: %s", e)
             return False
     
+    async def _get_assigned_session(self, session_manager: SessionManager, user_id: str) -> Optional[Dict[str, Any]]:
+        """Look up the user's AI-disabled assigned session through a short TTL cache."""
+        now = time.monotonic()
+        cached = self._ai_disabled_cache.get(user_id)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        session = await session_manager.get_active_assigned_session_for_user(user_id)
+        
+        if len(self._ai_disabled_cache) >= AI_DISABLED_CACHE_MAX_SIZE:
+            # Drop expired entries; if everything is still fresh, start over
+            self._ai_disabled_cache = {
+                key: entry for key, entry in self._ai_disabled_cache.items() if entry[0] > now
+            }
+            if len(self._ai_disabled_cache) >= AI_DISABLED_CACHE_MAX_SIZE:
+                self._ai_disabled_cache.clear()
+        self._ai_disabled_cache[user_id] = (now + AI_DISABLED_CACHE_TTL, session)
+        return session
+    
     def _create_human_assigned_state(self, message: SupportMessage) -> AgentState:
         """Create an AgentState indicating human agent is handling this conversation."""
-        from src.models.schemas import AgentResponse
-        
-        # Create a response indicating human agent is handling
-        human_response = AgentResponse(
-            agent_name="human_agent_handler",
-            response_text="Your request is currently being handled by one of our support specialists. They will respond shortly.",
-            confidence_score=1.0,
-            sources=[],
-            should_escalate=False,
-            escalation_reason="Human agent already assigned",
-            metadata={'ai_disabled': True, 'human_assigned': True}
-        )
+        # Fresh containers so callers never mutate the shared template
+        human_response = _HUMAN_ASSIGNED_TEMPLATE.model_copy(update={
+            'sources': [],
+            'metadata': {'ai_disabled': True, 'human_assigned': True}
+        })
         
         return AgentState(
             message=message,
@@ -364,5 +443,13 @@ class DelveLangGraphWorkflow:
         )
 
 
-# Global instance
-delve_langgraph_workflow = DelveLangGraphWorkflow()
\ No newline at end of file
+# Global instance, built on first use so importing this module does no I/O
+_instance: Optional[DelveLangGraphWorkflow] = None
+
+
+def get_workflow() -> DelveLangGraphWorkflow:
+    """Get the shared DelveLangGraphWorkflow, creating it on first call."""
+    global _instance
+    if _instance is None:
+        _instance = DelveLangGraphWorkflow()
+    return _instance
\ No newline at end of file
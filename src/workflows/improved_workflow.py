@@ -3,17 +3,57 @@ Enhanced workflow using the new multi-agent architecture.
 Upgraded from single-agent to intelligent multi-agent system with specialized routing.
 """
 
+import asyncio
+import copy
+import importlib
 import logging
-from typing import Dict, Any
+import time
+from types import MappingProxyType
+from typing import Dict, Any, AsyncIterator, Optional, Set, Tuple
 from datetime import datetime
 
-from src.models.schemas import AgentState, SupportMessage
+from src.models.schemas import AgentResponse, AgentState, SupportMessage
 from src.integrations.slack_client import slack_client
-# NOTE: Import multi_agent_system lazily to avoid circular imports
+from src.integrations.slack_queue import slack_send_queue
+# NOTE: multi_agent_system is bound lazily at the bottom of this module to avoid circular imports
 
 
 logger = logging.getLogger(__name__)
 
+# An answer ready within this many seconds goes out without a separate acknowledgment
+ACK_GRACE_PERIOD = 0.3
+
+# Stats endpoints may be scraped in bursts; reuse a snapshot this long (seconds)
+STATS_CACHE_TTL = 1.0
+
+# Reply sent when the workflow itself fails
+_ERR_MSG = "I'm experiencing technical difficulties. Let me get a human agent to help you immediately."
+
+# Escalation replies, written out in full so each call returns a ready-made string
+_MSG_LOW_CONF = "I've analyzed your question and want to make sure you get the most accurate help. Your question requires specialized expertise that our human team can provide better. Someone will be with you shortly! 👩‍💼"
+_MSG_SALES = "I've analyzed your question and want to make sure you get the most accurate help. For sales inquiries and demos, our sales team can provide personalized assistance and answer specific questions about pricing and implementation. Someone will reach out shortly! 💼"
+_MSG_TECHNICAL = "I've analyzed your question and want to make sure you get the most accurate help. For technical integration questions, our engineering team can provide detailed guidance and custom solutions. A technical expert will be with you soon! 🔧"
+_MSG_URGENT = "I've analyzed your question and want to make sure you get the most accurate help. I see this is urgent - I've prioritized your request and a team member will assist you immediately! ⚡"
+_MSG_DEFAULT = "I've analyzed your question and want to make sure you get the most accurate help. Our human experts will provide you with comprehensive assistance. Someone will be with you shortly! 🚀"
+
+_ESCALATION_TEMPLATES = MappingProxyType({
+    "low_conf": _MSG_LOW_CONF,
+    "sales": _MSG_SALES,
+    "technical": _MSG_TECHNICAL,
+    "urgent": _MSG_URGENT,
+    "default": _MSG_DEFAULT,
+})
+
+# (keyword in the lowered escalation reason, template key), checked in order
+_ESCALATION_KEYWORDS = (
+    ("sales", "sales"),
+    ("technical", "technical"),
+    ("urgent", "urgent"),
+)
+
+# Strong references to in-flight background sends; the event loop only keeps weak ones
+_background_tasks: Set[asyncio.Task] = set()
+
 
 class ImprovedWorkflow:
     """
@@ -24,6 +64,10 @@ class ImprovedWorkflow:
     def __init__(self):
         self.workflow_name = "enhanced_multi_agent_workflow"
         self.system_initialized = False
+        # Serializes first-time initialization so concurrent first requests run it once
+        self._init_lock = asyncio.Lock()
+        # (expires_at, stats) from the last get_stats call
+        self._stats_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         logger.info("Enhanced multi-agent workflow initialized")
     
     async def process_message(self, message: SupportMessage) -> AgentState:
@@ -36,105 +80,158 @@ class ImprovedWorkflow:
         Returns:
             AgentState with processing results
         """
+        # Local aliases for the logger methods used on this path
+        info, err = logger.info, logger.error
+        
         try:
             # Initialize multi-agent system if needed
             if not self.system_initialized:
-                await self._initialize_system()
+                await self._ensure_initialized()
             
-            # Create initial state
+            # Create initial state; elapsed time comes from the monotonic perf counter
             state = AgentState(message=message)
-            logger.info(f"Starting enhanced multi-agent workflow for message {message.message_id}")
+            started = time.perf_counter()
+            info("Starting enhanced multi-agent workflow for message %s", message.message_id)
             
-            # Step 1: Send immediate acknowledgment
+            # Steps 1-2: Process through the multi-agent system, acknowledging only if it is slow.
+            # The group waits for both, so any ack lands before the response, and a
+            # failed run cancels the pending ack instead of leaving it running.
             try:
-                await slack_client.send_acknowledgment(message)
-                logger.info(f"Acknowledgment sent for message {message.message_id}")
-            except Exception as e:
-                logger.warning(f"Could not send acknowledgment: {e}")
-            
-            # Step 2: Process through multi-agent system
-            # Lazy import to avoid circular imports
-            from src.agents.multi_agent_system import multi_agent_system
-            agent_response = await multi_agent_system.process_message(message)
+                async with asyncio.TaskGroup() as tg:
+                    agent_task = tg.create_task(multi_agent_system.process_message(message))
+                    tg.create_task(self._ack_if_slow(message, agent_task))
+            except ExceptionGroup as group:
+                # The ack helpers never raise, so the only error is the agent's; report it unwrapped
+                raise group.exceptions[0]
+            agent_response = agent_task.result()
             state.agent_responses.append(agent_response)
             
             # Step 3: Handle response - escalation is already handled by multi-agent system
             state.final_response = agent_response.response_text
             state.escalated = agent_response.should_escalate
             
-            # Step 4: Send response to Slack
-            try:
-                if agent_response.should_escalate:
-                    # Response already includes escalation message
-                    await slack_client.send_response(
-                        message,
-                        agent_response.response_text,
-                        agent_response.sources
-                    )
-                    logger.info(f"Escalation response sent for message {message.message_id}")
-                else:
-                    # Send normal response
-                    await slack_client.send_response(
-                        message,
-                        agent_response.response_text,
-                        agent_response.sources
-                    )
-                    logger.info(f"Agent response sent for message {message.message_id}")
-            except Exception as e:
-                logger.warning(f"Could not send response: {e}")
-            
-            # Mark processing as completed
+            # Step 4: Send response to Slack in the background; callers only need the state
+            send_task = asyncio.create_task(self._safe_send(message, agent_response))
+            _background_tasks.add(send_task)
+            send_task.add_done_callback(_background_tasks.discard)
+            
+            # Mark processing as completed; the wall-clock stamp is kept for callers of the state
             state.processing_completed = datetime.now()
             
             # Log final metrics
-            processing_time = (
-                state.processing_completed - state.processing_started
-            ).total_seconds()
-            
-            logger.info(
-                f"Message {message.message_id} processed in {processing_time:.2f}s. "
-                f"Agent: {agent_response.agent_name}, "
-                f"Confidence: {agent_response.confidence_score:.2f}, "
-                f"Escalated: {state.escalated}"
+            processing_time = time.perf_counter() - started
+            
+            info(
+                "Message %s processed in %.2fs. Agent: %s, Confidence: %.2f, Escalated: %s",
+                message.message_id, processing_time, agent_response.agent_name,
+                agent_response.confidence_score, state.escalated
             )
             
             return state
             
         except Exception as e:
-            logger.error(f"Error in improved workflow: {e}")
+            err("Error in improved workflow: %s", e)
             
-            # Create error state with escalation
-            error_state = AgentState(
+            # Create error state with escalation; every field is already trusted, so skip validation.
+            # Started and completed are the same instant here, so one clock read serves both.
+            now = datetime.now()
+            error_state = AgentState.model_construct(
                 message=message,
                 agent_responses=[],
                 escalated=True,
-                final_response="I'm experiencing technical difficulties. Let me get a human agent to help you immediately.",
-                processing_completed=datetime.now()
+                final_response=_ERR_MSG,
+                processing_started=now,
+                processing_completed=now
             )
             
             # Try to notify about the error
             try:
-                await slack_client.send_response(
+                await slack_send_queue.enqueue(
+                    message.channel_id,
+                    slack_client.send_response,
                     message,
                     error_state.final_response
                 )
-                await slack_client.send_escalation_notification(
+                await slack_send_queue.enqueue(
+                    message.channel_id,
+                    slack_client.send_escalation_notification,
                     message,
                     f"Workflow processing error: {str(e)}"
                 )
             except Exception as fallback_error:
-                logger.error(f"Even fallback notification failed: {fallback_error}")
+                err("Even fallback notification failed: %s", fallback_error)
             
             return error_state
     
+    async def _ack_if_slow(self, message: SupportMessage, agent_task: asyncio.Task) -> None:
+        """Acknowledge the message unless the agent answers within ACK_GRACE_PERIOD."""
+        done, _ = await asyncio.wait({agent_task}, timeout=ACK_GRACE_PERIOD)
+        if done:
+            logger.debug("Skipping acknowledgment for message %s; answer was fast", message.message_id)
+            return
+        await self._safe_ack(message)
+    
+    async def _safe_ack(self, message: SupportMessage) -> None:
+        """Send the acknowledgment, logging instead of raising on failure."""
+        try:
+            await slack_send_queue.enqueue(message.channel_id, slack_client.send_acknowledgment, message)
+            logger.info("Acknowledgment queued for message %s", message.message_id)
+        except Exception as e:
+            logger.warning("Could not send acknowledgment: %s", e)
+    
+    async def _safe_send(self, message: SupportMessage, agent_response: AgentResponse) -> None:
+        """Send the agent response, logging instead of raising on failure."""
+        try:
+            # Escalated responses already include the escalation message, so both go out as-is
+            await slack_send_queue.enqueue(
+                message.channel_id,
+                slack_client.send_response,
+                message,
+                agent_response.response_text,
+                agent_response.sources
+            )
+            if logger.isEnabledFor(logging.INFO):
+                label = 'Escalation' if agent_response.should_escalate else 'Agent'
+                logger.info("%s response queued for message %s", label, message.message_id)
+        except Exception as e:
+            logger.warning("Could not send response: %s", e)
+    
+    async def aclose(self) -> None:
+        """Wait for background Slack sends to finish; call before shutting down."""
+        if _background_tasks:
+            await asyncio.gather(*_background_tasks, return_exceptions=True)
+        await slack_send_queue.shutdown()
+    
+    async def stream_message(self, message: SupportMessage) -> AsyncIterator[AgentResponse]:
+        """
+        Stream processing stages for interactive callers such as the dashboard.
+        
+        Yields an intake response as soon as the message is accepted, then the
+        agent response once the multi-agent system returns. Nothing is sent to Slack.
+        """
+        if not self.system_initialized:
+            await self._ensure_initialized()
+        
+        yield AgentResponse(
+            agent_name="intake",
+            response_text="",
+            confidence_score=1.0,
+            metadata={"stage": "intake", "message_id": message.message_id}
+        )
+        
+        yield await multi_agent_system.process_message(message)
+    
+    async def _ensure_initialized(self):
+        """Initialize the system under the init lock, re-checking once the lock is held."""
+        async with self._init_lock:
+            if not self.system_initialized:
+                await self._initialize_system()
+    
     async def _initialize_system(self):
         """Initialize the multi-agent system if not already done."""
         try:
             logger.info("Initializing multi-agent system...")
             
-            # Lazy import to avoid circular imports
-            from src.agents.multi_agent_system import multi_agent_system
-            
             success = await multi_agent_system.initialize()
             
             if success:
@@ -145,29 +242,18 @@ class ImprovedWorkflow:
                 # Continue with degraded functionality
                 
         except Exception as e:
-            logger.error(f"Error initializing multi-agent system: {e}")
+            logger.error("Error initializing multi-agent system: %s", e)
             # Continue with degraded functionality
     
     def _create_escalation_message(self, rag_response) -> str:
         """Create an appropriate escalation message based on the RAG response."""
-        
-        base_message = "I've analyzed your question and want to make sure you get the most accurate help."
-        
         # Customize based on confidence and reason
         if rag_response.confidence_score < 0.5:
-            return f"{base_message} Your question requires specialized expertise that our human team can provide better. Someone will be with you shortly! 👩‍💼"
+            return _ESCALATION_TEMPLATES["low_conf"]
         
-        elif "sales" in rag_response.escalation_reason.lower():
-            return f"{base_message} For sales inquiries and demos, our sales team can provide personalized assistance and answer specific questions about pricing and implementation. Someone will reach out shortly! 💼"
-        
-        elif "technical" in rag_response.escalation_reason.lower():
-            return f"{base_message} For technical integration questions, our engineering team can provide detailed guidance and custom solutions. A technical expert will be with you soon! 🔧"
-        
-        elif "urgent" in rag_response.escalation_reason.lower():
-            return f"{base_message} I see this is urgent - I've prioritized your request and a team member will assist you immediately! ⚡"
-        
-        else:
-            return f"{base_message} Our human experts will provide you with comprehensive assistance. Someone will be with you shortly! 🚀"
+        reason = (rag_response.escalation_reason or "").lower()
+        key = next((key for keyword, key in _ESCALATION_KEYWORDS if keyword in reason), "default")
+        return _ESCALATION_TEMPLATES.get(key, _MSG_DEFAULT)
     
     async def health_check(self) -> bool:
         """Check if the workflow is healthy."""
@@ -177,31 +263,51 @@ class ImprovedWorkflow:
                 logger.warning("Multi-agent system not initialized")
                 return False
             
-            # Lazy import to avoid circular imports
-            from src.agents.multi_agent_system import multi_agent_system
-            
             # Check multi-agent system health
             multi_agent_health = await multi_agent_system.health_check()
             return multi_agent_health["system_healthy"]
             
         except Exception as e:
-            logger.error(f"Workflow health check failed: {e}")
+            logger.error("Workflow health check failed: %s", e)
             return False
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get workflow statistics."""
+        """Get workflow statistics, reusing a snapshot for STATS_CACHE_TTL seconds."""
+        now = time.monotonic()
+        if self._stats_cache and now < self._stats_cache[0]:
+            # Hand out a copy so one caller's edits never reach the others
+            return copy.deepcopy(self._stats_cache[1])
+        
         multi_agent_stats = {}
         if self.system_initialized:
-            # Lazy import to avoid circular imports
-            from src.agents.multi_agent_system import multi_agent_system
             multi_agent_stats = multi_agent_system.get_performance_stats()
         
-        return {
+        stats = {
             'workflow_name': self.workflow_name,
             'system_initialized': self.system_initialized,
             'multi_agent_stats': multi_agent_stats
         }
+        self._stats_cache = (now + STATS_CACHE_TTL, stats)
+        return copy.deepcopy(stats)
+
+
+class _LazyProxy:
+    """Stand-in for a module attribute that is imported on first attribute access."""
+    
+    def __init__(self, module_name: str, attr_name: str):
+        self._module_name = module_name
+        self._attr_name = attr_name
+        self._obj = None
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names the proxy itself lacks, i.e. the target's attributes
+        if self._obj is None:
+            self._obj = getattr(importlib.import_module(self._module_name), self._attr_name)
+        return getattr(self._obj, name)
+
 
+# Resolved on first use rather than at import time to avoid circular imports
+multi_agent_system = _LazyProxy("src.agents.multi_agent_system", "multi_agent_system")
 
 # Global instance
-improved_workflow = ImprovedWorkflow()
\ No newline at end of file
+improved_workflow = ImprovedWorkflow()
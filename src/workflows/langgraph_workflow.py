@@ -5,19 +5,85 @@ Implements the vision.md architecture with proper intent detection, planning, an
 
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Literal
+import copy
+import importlib
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Annotated, Dict, Any, AsyncIterator, List, Optional, Literal, Tuple
 from datetime import datetime
 from enum import Enum
 import os
 
 from langgraph.graph import StateGraph, END, START
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Send
 from pydantic import BaseModel, Field
 
 from src.models.schemas import SupportMessage, AgentResponse
 
 logger = logging.getLogger(__name__)
 
+# Repeated message texts ("help", "schedule a demo") reuse their classification
+INTENT_CACHE_MAX_SIZE = 256
+# Entries expire so a degraded classification never sticks for long
+INTENT_CACHE_TTL = 300.0
+# IntentClassifier's default when neither patterns nor the LLM are confident; never cached
+INTENT_FALLBACK_CONFIDENCE = 0.60
+
+# Subgraph agent name -> (module, class); imported and built on first use to avoid circular imports
+_AGENT_CLASSES = MappingProxyType({
+    "demo_scheduler": ("src.agents.demo_scheduler", "DemoSchedulerAgent"),
+    "escalation": ("src.agents.escalation_agent", "EscalationAgent"),
+    "technical_support": ("src.agents.technical_support", "TechnicalSupportAgent"),
+    "rag_agent": ("src.agents.enhanced_rag_agent", "EnhancedRAGAgent"),
+})
+
+# Fallback intent patterns, compiled once at import.
+# Very explicit scheduling patterns (much more restrictive)
+_EXPLICIT_SCHEDULING = tuple(re.compile(p) for p in (
+    r'\b(?:can|could|would)\s+(?:we|you|i)\s+(?:schedule|book)\s+(?:a|an|the)\s*(?:demo|meeting|call)',
+    r'\bi\s+(?:want|need|would like)\s+to\s+(?:schedule|book)\s+(?:a|an|the)\s*(?:demo|meeting|call)',
+    r'\bschedule\s+(?:a|an|the)\s+(?:demo|meeting|call)\s*(?:with|for)',
+    r'\bbook\s+(?:a|an|the)\s+(?:demo|meeting|call)\s*(?:with|for)',
+    r'\b(?:when|what time)\s+(?:can|could|are)\s+(?:we|you)\s+(?:meet|schedule|have)\s+(?:a|the)\s*(?:demo|call)',
+))
+
+# Technical support patterns
+_TECHNICAL_PATTERNS = tuple(re.compile(p) for p in (
+    r'\b(?:error|bug|issue|problem|not working|broken|failed)',
+    r'\b(?:api|integration|technical|code|implementation)',
+    r'\b(?:troubleshoot|debug|fix|resolve)',
+))
+
+# Information seeking patterns (not scheduling)
+_INFO_PATTERNS = tuple(re.compile(p) for p in (
+    r'\b(?:what is|what does|how does|tell me about|explain)',
+    r'\b(?:documentation|docs|guide|tutorial)',
+    r'\b(?:compliance|soc2|iso|gdpr|hipaa)\b.*(?:work|process)',
+))
+
+
+def _build_fallback_scanner():
+    """
+    Fuse the fallback pattern lists into one regex matched at position 0.
+    
+    Each category is a lookahead over the whole text followed by an empty named
+    group, tried in priority order, so ``lastgroup`` names the first category
+    with any match anywhere, exactly as checking the lists in turn would.
+    """
+    branches = []
+    for name, patterns in (("sched", _EXPLICIT_SCHEDULING), ("tech", _TECHNICAL_PATTERNS), ("info", _INFO_PATTERNS)):
+        alternation = "|".join(f"(?:{pattern.pattern})" for pattern in patterns)
+        # [\s\S] rather than DOTALL so the patterns' own '.' keeps its meaning
+        branches.append(f"(?=[\\s\\S]*?(?:{alternation}))(?P<{name}>)")
+    return re.compile("|".join(branches))
+
+
+_FALLBACK_RE = _build_fallback_scanner()
+
 
 class IntentType(str, Enum):
     """Supported intent types for message classification."""
@@ -28,6 +94,30 @@ class IntentType(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Fallback scanner category -> (intent, confidence)
+_FALLBACK_INTENTS = MappingProxyType({
+    "sched": (IntentType.SCHEDULING, 0.85),
+    "tech": (IntentType.TECHNICAL_SUPPORT, 0.80),
+    "info": (IntentType.INFORMATION, 0.75),
+})
+
+
+def _merge_subgraph_outputs(
+    current: Dict[str, AgentResponse], update: Dict[str, AgentResponse]
+) -> Dict[str, AgentResponse]:
+    """
+    Reducer for WorkflowState.subgraph_outputs.
+    
+    Parallel run_subgraph branches each add their own entry. Nodes that return
+    the whole state re-send entries already merged, which is a no-op. An empty
+    update, such as a new run's input state, clears results the checkpointer
+    kept from an earlier run on the same thread.
+    """
+    if not update:
+        return {}
+    return {**current, **update}
+
+
 class WorkflowState(BaseModel):
     """State object that flows through the LangGraph workflow."""
     # Input
@@ -43,6 +133,8 @@ class WorkflowState(BaseModel):
     execution_plan: Dict[str, Any] = Field(default_factory=dict)
     
     # Execution Results
+    # subgraph_name -> response, merged from the parallel run_subgraph branches
+    subgraph_outputs: Annotated[Dict[str, AgentResponse], _merge_subgraph_outputs] = Field(default_factory=dict)
     subgraph_results: Dict[str, AgentResponse] = Field(default_factory=dict)
     
     # Final Output
@@ -63,7 +155,8 @@ class LangGraphWorkflow:
     LangGraph-based workflow system that implements the vision.md architecture.
     
     Graph Structure:
-    START -> intent_detector -> planner -> execute_subgraphs -> human_approval_gate -> finalize -> END
+    START -> intent_detector -> planner -> run_subgraph (one Send per subgraph)
+          -> execute_subgraphs -> human_approval_gate -> finalize -> END
     """
     
     def __init__(self):
@@ -72,6 +165,13 @@ class LangGraphWorkflow:
         self.responder_agent = None  # Will be initialized with dependency injection
         self.compiled_graph = None
         self.memory = MemorySaver()
+        # Normalized message text -> (expires_at, IntentClassifier result), least recently used first
+        self._intent_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._intent_classifier = None
+        # Subgraph agents, shared across messages; see _get_agent
+        self._agents: Dict[str, Any] = {}
+        self._rag_init_lock = asyncio.Lock()
+        self._rag_initialized = False
         self._build_graph()
     
     def set_responder_agent(self, responder_agent):
@@ -87,6 +187,7 @@ class LangGraphWorkflow:
         # Add nodes
         builder.add_node("intent_detector", self._detect_intent)
         builder.add_node("planner", self._plan_execution)
+        builder.add_node("run_subgraph", self._run_subgraph)
         builder.add_node("execute_subgraphs", self._execute_subgraphs)
         builder.add_node("human_approval_gate", self._human_approval_gate)
         builder.add_node("finalize", self._finalize_response)
@@ -94,7 +195,10 @@ class LangGraphWorkflow:
         # Add edges
         builder.add_edge(START, "intent_detector")
         builder.add_edge("intent_detector", "planner")
-        builder.add_edge("planner", "execute_subgraphs")
+        
+        # Fan out one run_subgraph branch per selected subgraph; branches run in the same step
+        builder.add_conditional_edges("planner", self._dispatch_subgraphs, ["run_subgraph", "execute_subgraphs"])
+        builder.add_edge("run_subgraph", "execute_subgraphs")
         
         # Conditional edge for human approval
         builder.add_conditional_edges(
@@ -136,12 +240,8 @@ class LangGraphWorkflow:
             
             content_lower = state.message.content.lower()
             
-            # Import the intent classifier
-            from src.core.intent_classifier import IntentClassifier
-            classifier = IntentClassifier()
-            
             # Use AI-powered intent classification
-            intent_result = await classifier.classify_intent(state.message.content)
+            intent_result = await self._classify_intent(state.message.content)
             
             state.intent = IntentType(intent_result.get('intent', 'unknown'))
             state.intent_confidence = intent_result.get('confidence', 0.0)
@@ -163,50 +263,60 @@ class LangGraphWorkflow:
         
         return state
     
+    async def _classify_intent(self, content: str) -> Dict[str, Any]:
+        """
+        Classify through IntentClassifier, reusing results for repeated message text.
+        
+        The classifier swallows LLM failures and returns its low-confidence
+        default, so that result is never cached; other entries expire after
+        INTENT_CACHE_TTL. Callers always get their own copy.
+        """
+        key = content.lower().strip()
+        now = time.monotonic()
+        cached = self._intent_cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                self._intent_cache.move_to_end(key)
+                return copy.deepcopy(cached[1])
+            del self._intent_cache[key]
+        
+        if self._intent_classifier is None:
+            from src.core.intent_classifier import IntentClassifier
+            self._intent_classifier = IntentClassifier()
+        
+        result = await self._intent_classifier.classify_intent(content)
+        if result.get('confidence', 0.0) > INTENT_FALLBACK_CONFIDENCE:
+            self._intent_cache[key] = (now + INTENT_CACHE_TTL, copy.deepcopy(result))
+            if len(self._intent_cache) > INTENT_CACHE_MAX_SIZE:
+                self._intent_cache.popitem(last=False)
+        return result
+    
+    def _get_agent(self, name: str):
+        """Get the shared agent for a subgraph, building it on first use."""
+        agent = self._agents.get(name)
+        if agent is None:
+            module_name, class_name = _AGENT_CLASSES[name]
+            agent = self._agents[name] = getattr(importlib.import_module(module_name), class_name)()
+        return agent
+    
+    async def _ensure_rag_initialized(self):
+        """Initialize the RAG agent once; concurrent first messages wait on the same attempt."""
+        if self._rag_initialized:
+            return
+        async with self._rag_init_lock:
+            if not self._rag_initialized:
+                self._rag_initialized = await self._get_agent("rag_agent").initialize()
+    
     def _fallback_intent_detection(self, content_lower: str) -> tuple[IntentType, float]:
         """Fallback rule-based intent detection."""
-        # Very explicit scheduling patterns (much more restrictive)
-        explicit_scheduling = [
-            r'\b(?:can|could|would)\s+(?:we|you|i)\s+(?:schedule|book)\s+(?:a|an|the)\s*(?:demo|meeting|call)',
-            r'\bi\s+(?:want|need|would like)\s+to\s+(?:schedule|book)\s+(?:a|an|the)\s*(?:demo|meeting|call)',
-            r'\bschedule\s+(?:a|an|the)\s+(?:demo|meeting|call)\s*(?:with|for)',
-            r'\bbook\s+(?:a|an|the)\s+(?:demo|meeting|call)\s*(?:with|for)',
-            r'\b(?:when|what time)\s+(?:can|could|are)\s+(?:we|you)\s+(?:meet|schedule|have)\s+(?:a|the)\s*(?:demo|call)',
-        ]
-        
-        # Technical support patterns
-        technical_patterns = [
-            r'\b(?:error|bug|issue|problem|not working|broken|failed)',
-            r'\b(?:api|integration|technical|code|implementation)',
-            r'\b(?:troubleshoot|debug|fix|resolve)',
-        ]
-        
-        # Information seeking patterns (not scheduling)
-        info_patterns = [
-            r'\b(?:what is|what does|how does|tell me about|explain)',
-            r'\b(?:documentation|docs|guide|tutorial)',
-            r'\b(?:compliance|soc2|iso|gdpr|hipaa)\b.*(?:work|process)',
-        ]
-        
-        import re
-        
-        # Check scheduling first (but lower confidence if mixed with other concerns)
-        for pattern in explicit_scheduling:
-            if re.search(pattern, content_lower):
-                # Lower confidence if it mentions audit, compliance issues
-                if any(word in content_lower for word in ['audit', 'compliance', 'certificate', 'done in', 'months', 'weeks']):
-                    return IntentType.INFORMATION, 0.75  # Treat as information request instead
-                return IntentType.SCHEDULING, 0.85
-        
-        # Check technical support
-        for pattern in technical_patterns:
-            if re.search(pattern, content_lower):
-                return IntentType.TECHNICAL_SUPPORT, 0.80
-        
-        # Check information seeking
-        for pattern in info_patterns:
-            if re.search(pattern, content_lower):
-                return IntentType.INFORMATION, 0.75
+        # One pass finds the highest-priority category: scheduling, then technical, then information
+        match = _FALLBACK_RE.match(content_lower)
+        if match:
+            category = match.lastgroup
+            # Lower scheduling confidence if mixed with audit/compliance concerns
+            if category == "sched" and any(word in content_lower for word in ['audit', 'compliance', 'certificate', 'done in', 'months', 'weeks']):
+                return IntentType.INFORMATION, 0.75  # Treat as information request instead
+            return _FALLBACK_INTENTS[category]
         
         # Default to information with low confidence
         return IntentType.INFORMATION, 0.60
@@ -294,67 +404,61 @@ class LangGraphWorkflow:
         
         return state
     
-    async def _execute_subgraphs(self, state: WorkflowState) -> WorkflowState:
-        """Node 3: Execute the selected subgraphs in parallel."""
+    def _dispatch_subgraphs(self, state: WorkflowState):
+        """Conditional edge: Send each selected subgraph to its own run_subgraph branch."""
+        if not state.selected_subgraphs:
+            return "execute_subgraphs"
+        
         logger.info(f"Executing subgraphs: {state.selected_subgraphs}")
+        return [
+            Send("run_subgraph", state.model_copy(update={"selected_subgraphs": [subgraph_name]}))
+            for subgraph_name in state.selected_subgraphs
+        ]
+    
+    async def _run_subgraph(self, state: WorkflowState) -> Dict[str, Any]:
+        """Node 3a: Run the single subgraph this branch was sent for."""
+        subgraph_name = state.selected_subgraphs[0]
+        
+        try:
+            factory = self._SUBGRAPH_FACTORIES.get(subgraph_name)
+            if factory is None:
+                raise ValueError(f"Unknown subgraph: {subgraph_name}")
+            result = await factory(self, state)
+        except Exception as e:
+            logger.error(f"Subgraph {subgraph_name} failed: {e}")
+            # Create error response
+            result = AgentResponse(
+                agent_name=f"{subgraph_name}_error",
+                response_text="I encountered an error processing your request.",
+                confidence_score=0.0,
+                sources=[],
+                should_escalate=True,
+                escalation_reason=f"Subgraph execution error: {str(e)}",
+                metadata={"error": True}
+            )
         
-        # Execute subgraphs in parallel using asyncio.gather
-        tasks = []
-        subgraph_names = []
+        # Only the reducer field is returned so parallel branches never write the same key
+        return {"subgraph_outputs": {subgraph_name: result}}
+    
+    async def _execute_subgraphs(self, state: WorkflowState) -> WorkflowState:
+        """Node 3b: Collect the parallel subgraph outputs into subgraph_results."""
+        outputs = state.subgraph_outputs
         
+        # Keep the planner's order rather than whichever branch finished first
         for subgraph_name in state.selected_subgraphs:
-            if subgraph_name == "demo_scheduler":
-                tasks.append(self._execute_demo_scheduler_subgraph(state))
-            elif subgraph_name == "escalation":
-                tasks.append(self._execute_escalation_subgraph(state))
-            elif subgraph_name == "technical_support":
-                tasks.append(self._execute_technical_support_subgraph(state))
-            elif subgraph_name == "rag_agent":
-                tasks.append(self._execute_rag_subgraph(state))
-            subgraph_names.append(subgraph_name)
+            if subgraph_name in outputs:
+                state.subgraph_results[subgraph_name] = outputs[subgraph_name]
         
-        try:
-            # Execute all subgraphs in parallel
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results
-            for i, result in enumerate(results):
-                subgraph_name = subgraph_names[i]
-                if isinstance(result, Exception):
-                    logger.error(f"Subgraph {subgraph_name} failed: {result}")
-                    # Create error response
-                    error_response = AgentResponse(
-                        agent_name=f"{subgraph_name}_error",
-                        response_text="I encountered an error processing your request.",
-                        confidence_score=0.0,
-                        sources=[],
-                        should_escalate=True,
-                        escalation_reason=f"Subgraph execution error: {str(result)}",
-                        metadata={"error": True}
-                    )
-                    state.subgraph_results[subgraph_name] = error_response
-                else:
-                    state.subgraph_results[subgraph_name] = result
-            
-            logger.info(f"Subgraph execution completed. Results: {len(state.subgraph_results)}")
-            
-        except Exception as e:
-            logger.error(f"Critical error in subgraph execution: {e}")
-            state.error_details = str(e)
+        logger.info(f"Subgraph execution completed. Results: {len(state.subgraph_results)}")
         
         return state
     
     async def _execute_demo_scheduler_subgraph(self, state: WorkflowState) -> AgentResponse:
         """Execute the demo scheduler subgraph."""
-        from src.agents.demo_scheduler import DemoSchedulerAgent
-        
-        agent = DemoSchedulerAgent()
-        return await agent.process_message(state.message)
+        return await self._get_agent("demo_scheduler").process_message(state.message)
     
     async def _execute_escalation_subgraph(self, state: WorkflowState) -> AgentResponse:
         """Execute the escalation subgraph for moderation and human handoff."""
-        from src.agents.escalation_agent import EscalationAgent
-        
         # Check for suggested response from moderation
         moderation_data = state.intent_metadata.get('moderation', {})
         suggested_response = moderation_data.get('suggested_response')
@@ -374,23 +478,24 @@ class LangGraphWorkflow:
             )
         else:
             # Regular escalation
-            agent = EscalationAgent()
-            return await agent.process_message(state.message)
+            return await self._get_agent("escalation").process_message(state.message)
     
     async def _execute_technical_support_subgraph(self, state: WorkflowState) -> AgentResponse:
         """Execute the technical support subgraph."""
-        from src.agents.technical_support import TechnicalSupportAgent
-        
-        agent = TechnicalSupportAgent()
-        return await agent.process_message(state.message)
+        return await self._get_agent("technical_support").process_message(state.message)
     
     async def _execute_rag_subgraph(self, state: WorkflowState) -> AgentResponse:
         """Execute the RAG subgraph."""
-        from src.agents.enhanced_rag_agent import EnhancedRAGAgent
-        
-        agent = EnhancedRAGAgent()
-        await agent.initialize()  # Ensure RAG is initialized
-        return await agent.process_message(state.message)
+        await self._ensure_rag_initialized()
+        return await self._get_agent("rag_agent").process_message(state.message)
+    
+    # Subgraph name -> executor, called as factory(self, state) from _run_subgraph
+    _SUBGRAPH_FACTORIES = MappingProxyType({
+        "demo_scheduler": _execute_demo_scheduler_subgraph,
+        "escalation": _execute_escalation_subgraph,
+        "technical_support": _execute_technical_support_subgraph,
+        "rag_agent": _execute_rag_subgraph,
+    })
     
     def _should_require_approval(self, state: WorkflowState) -> Literal["approve", "skip"]:
         """Conditional edge: Determine if human approval is needed."""
@@ -667,6 +772,24 @@ class LangGraphWorkflow:
             
             return error_state
     
+    async def astream(self, message: SupportMessage) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run the workflow and yield (node_name, update) as each node finishes.
+        
+        Unlike process_message, errors are raised to the caller rather than
+        turned into an error state.
+        """
+        logger.info("Streaming message %s through LangGraph workflow", message.message_id)
+        
+        initial_state = WorkflowState(message=message)
+        config = {"configurable": {"thread_id": f"msg_{message.message_id}"}}
+        
+        async for chunk in self.compiled_graph.astream(initial_state, config=config, stream_mode="updates"):
+            for node_name, update in chunk.items():
+                if isinstance(update, BaseModel):
+                    update = dict(update)
+                yield node_name, update or {}
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check workflow health."""
         try:
@@ -679,27 +802,21 @@ class LangGraphWorkflow:
             
             # Test demo scheduler
             try:
-                from src.agents.demo_scheduler import DemoSchedulerAgent
-                demo_agent = DemoSchedulerAgent()
-                agent_health["demo_scheduler"] = await demo_agent.health_check()
+                agent_health["demo_scheduler"] = await self._get_agent("demo_scheduler").health_check()
             except Exception as e:
                 agent_health["demo_scheduler"] = False
                 logger.error(f"Demo scheduler health check failed: {e}")
             
             # Test RAG agent
             try:
-                from src.agents.enhanced_rag_agent import EnhancedRAGAgent
-                rag_agent = EnhancedRAGAgent()
-                agent_health["rag_agent"] = await rag_agent.health_check()
+                agent_health["rag_agent"] = await self._get_agent("rag_agent").health_check()
             except Exception as e:
                 agent_health["rag_agent"] = False
                 logger.error(f"RAG agent health check failed: {e}")
             
             # Test technical support
             try:
-                from src.agents.technical_support import TechnicalSupportAgent
-                tech_agent = TechnicalSupportAgent()
-                agent_health["technical_support"] = await tech_agent.health_check()
+                agent_health["technical_support"] = await self._get_agent("technical_support").health_check()
             except Exception as e:
                 agent_health["technical_support"] = False
                 logger.error(f"Technical support health check failed: {e}")
@@ -718,5 +835,11 @@ class LangGraphWorkflow:
             return {"healthy": False, "error": str(e)}
 
 
+@lru_cache(maxsize=1)
+def get_langgraph_workflow() -> LangGraphWorkflow:
+    """Get the process-wide LangGraphWorkflow; its graph is compiled on the first call only."""
+    return LangGraphWorkflow()
+
+
 # Global instance
-langgraph_workflow = LangGraphWorkflow()
\ No newline at end of file
+langgraph_workflow = get_langgraph_workflow()
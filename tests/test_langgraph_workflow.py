@@ -0,0 +1,62 @@
+"""Tests for the LangGraph workflow."""
+
+import importlib
+from datetime import datetime
+
+import pytest
+
+from src.models.schemas import AgentResponse, SupportMessage
+from src.workflows.langgraph_workflow import (
+    LangGraphWorkflow,
+    WorkflowState,
+    get_langgraph_workflow,
+    langgraph_workflow,
+)
+
+
+def _message(content: str) -> SupportMessage:
+    return SupportMessage(
+        message_id="1700000000.000100",
+        channel_id="test_channel",
+        user_id="U123",
+        timestamp=datetime.now(),
+        content=content
+    )
+
+
+def test_compiled_workflow_is_shared_across_lookups_and_imports():
+    """The process-wide workflow, and its compiled graph, are built once."""
+    assert get_langgraph_workflow() is langgraph_workflow
+
+    reimported = importlib.import_module("src.workflows.langgraph_workflow")
+    assert reimported.langgraph_workflow is langgraph_workflow
+    assert reimported.get_langgraph_workflow().compiled_graph is langgraph_workflow.compiled_graph
+
+
+@pytest.mark.asyncio
+async def test_second_message_on_thread_does_not_reuse_subgraph_outputs(monkeypatch):
+    """A later run on the same checkpointed thread only sees its own subgraph outputs."""
+    workflow = LangGraphWorkflow()
+
+    async def classify(content):
+        return {"intent": "information", "confidence": 0.9}
+
+    async def fake_rag(self, state):
+        return AgentResponse(
+            agent_name="rag_agent",
+            response_text=f"answer to {state.message.content}",
+            confidence_score=0.9
+        )
+
+    monkeypatch.setattr(workflow, "_classify_intent", classify)
+    monkeypatch.setattr(workflow, "_SUBGRAPH_FACTORIES", {"rag_agent": fake_rag})
+
+    config = {"configurable": {"thread_id": "shared_thread"}}
+    await workflow.compiled_graph.ainvoke(WorkflowState(message=_message("first question")), config=config)
+    final_state = await workflow.compiled_graph.ainvoke(WorkflowState(message=_message("second question")), config=config)
+
+    outputs = final_state["subgraph_outputs"]
+    assert list(outputs) == ["rag_agent"]
+    assert outputs["rag_agent"].response_text == "answer to second question"
+    assert final_state["subgraph_results"]["rag_agent"].response_text == "answer to second question"
+    assert final_state["final_response"].response_text == "answer to second question"